@@ -54,7 +54,7 @@ from api_gateway.routes import accuracy, history, insights, live, notifications,
 from ml_engine.cache.sqlite_cache import SqliteCache, recover_corrupt_sqlite_db
 from ml_engine.config import cache_db_path
 from ml_engine.resilience.bulkheads import run_cpu
-from ml_engine.resilience.timeouts import default_deadline_ms, reset_deadline, set_deadline_ms
+from ml_engine.resilience.timeouts import deadline_scope, default_deadline_ms
 
 try:
     import certifi  # type: ignore
@@ -120,11 +120,8 @@ app.include_router(backtest_trends_router, prefix="/api")
 
 
 async def _run_cpu_with_deadline(fn, /, *args: Any, **kwargs: Any):
-    tok = set_deadline_ms(default_deadline_ms())
-    try:
+    with deadline_scope(default_deadline_ms()):
         return await run_cpu(fn, *args, **kwargs)
-    finally:
-        reset_deadline(tok)
 
 
 def _effective_data_provider() -> str:
@@ -6,7 +6,7 @@ from typing import Any
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 
-from ml_engine.resilience.timeouts import default_deadline_ms, reset_deadline, set_deadline_ms
+from ml_engine.resilience.timeouts import deadline_scope, default_deadline_ms
 
 
 def _max_body_bytes() -> int:
@@ -28,10 +28,9 @@ def _is_json_content_type(request: Request) -> bool:
 
 
 async def request_limits_middleware(request: Request, call_next: Any) -> Response:
-    tok = set_deadline_ms(default_deadline_ms())
-    path = str(getattr(request.url, "path", "") or "")
-    method = str(getattr(request, "method", "") or "").upper()
-    try:
+    with deadline_scope(default_deadline_ms()):
+        path = str(getattr(request.url, "path", "") or "")
+        method = str(getattr(request, "method", "") or "").upper()
         if path.startswith("/api/") and method in {"POST", "PUT", "PATCH"}:
             if not _is_json_content_type(request):
                 return JSONResponse(status_code=415, content={"error": "unsupported_media_type"})
@@ -54,5 +53,3 @@ async def request_limits_middleware(request: Request, call_next: Any) -> Respons
         resp.headers["x-content-type-options"] = "nosniff"
         resp.headers["x-frame-options"] = "DENY"
         return resp
-    finally:
-        reset_deadline(tok)
@@ -0,0 +1,46 @@
+"""Small helpers shared by the standalone scripts in this directory.
+
+The scripts are run directly (``python api_gateway/scripts/<name>.py``), which puts
+this directory on ``sys.path``, so they import this module by its bare name.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+
+def first_non_empty(d: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    """Return the first non-empty value among ``keys`` (one lookup in the common case).
+
+    Unlike ``d.get(a) or d.get(b)`` a legitimate ``0`` is kept.
+    """
+    for k in keys:
+        v = d.get(k)
+        if v is not None and v != "":
+            return v
+    return None
+
+
+def first_present(d: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    """Return the value of the first of ``keys`` present in ``d``, even if it is ``None``.
+
+    Same precedence as ``d.get(a, d.get(b))``: an alias is only read when the primary
+    key is missing altogether.
+    """
+    for k in keys:
+        if k in d:
+            return d[k]
+    return None
+
+
+# Championships, tiers and bucket labels come from tiny closed sets: interning them
+# lets the aggregation keys compare by identity instead of by content.
+_INTERNED: dict[str, str] = {}
+
+
+def intern_label(s: str) -> str:
+    v = _INTERNED.get(s)
+    if v is None:
+        v = _INTERNED.setdefault(s, sys.intern(s))
+    return v
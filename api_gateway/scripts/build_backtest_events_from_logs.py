@@ -28,6 +28,14 @@ import json
 from pathlib import Path
 from typing import Any
 
+from _script_utils import first_non_empty as _first
+from _script_utils import first_present as _first_present
+
+
+_OUTCOME_KEYS = ("outcome", "result")
+_HOME_GOAL_KEYS = ("home_goals", "hg")
+_AWAY_GOAL_KEYS = ("away_goals", "ag")
+
 
 def iter_jsonl(path: Path):
     if not path.exists():
@@ -84,8 +92,8 @@ def norm_outcome(x: Any) -> str | None:
 
 
 def outcome_from_goals(r: dict[str, Any]) -> str | None:
-    hg = r.get("home_goals", r.get("hg"))
-    ag = r.get("away_goals", r.get("ag"))
+    hg = _first_present(r, _HOME_GOAL_KEYS)
+    ag = _first_present(r, _AWAY_GOAL_KEYS)
     try:
         hg = int(hg)
         ag = int(ag)
@@ -128,7 +136,7 @@ def main() -> int:
             if not mid or mid not in results:
                 continue
             r = results[mid]
-            actual = norm_outcome(r.get("outcome") or r.get("result")) or outcome_from_goals(r)
+            actual = norm_outcome(_first(r, _OUTCOME_KEYS)) or outcome_from_goals(r)
             if actual is None:
                 continue
 
@@ -38,6 +38,12 @@ import json
 from pathlib import Path
 from typing import Any, Iterable
 
+from _script_utils import first_present as _first_present
+from _script_utils import intern_label as _intern
+
+_CHAOS_KEYS = ("chaos_index", "chaos")
+_FRAGILITY_KEYS = ("fragility_level", "fragility")
+
 
 def clamp01(x: float) -> float:
     return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
@@ -141,21 +147,23 @@ def main() -> int:
         return 0
 
     # bucket -> [hits, n]
-    agg: dict[str, dict[str, float]] = {}
+    agg: dict[tuple[str, str, str, str], dict[str, float]] = {}
     skipped = 0
 
     for r in records:
         champ = str(r.get("championship") or r.get("league") or "").strip()
         tier = str(r.get("tier") or r.get("confidence_tier") or "").strip()
-        chaos = r.get("chaos_index", r.get("chaos"))
-        frag = r.get("fragility_level", r.get("fragility"))
+        chaos = _first_present(r, _CHAOS_KEYS)
+        frag = _first_present(r, _FRAGILITY_KEYS)
 
         hit = derive_hit(r)
         if not champ or not tier or hit is None:
             skipped += 1
             continue
 
-        k = f"{champ}|{tier}|{bucketize_chaos(float(chaos) if chaos is not None else None)}|{norm_fragility(str(frag) if frag is not None else None)}"
+        chaos_b = bucketize_chaos(float(chaos) if chaos is not None else None)
+        frag_n = norm_fragility(str(frag) if frag is not None else None)
+        k = (_intern(champ), _intern(tier), _intern(chaos_b), _intern(frag_n))
         row = agg.setdefault(k, {"hits": 0.0, "n": 0.0})
         row["hits"] += 1.0 if hit else 0.0
         row["n"] += 1.0
@@ -166,7 +174,7 @@ def main() -> int:
         if n < min_samples:
             continue
         acc = clamp01(row["hits"] / max(1.0, row["n"]))
-        out[k] = {"accuracy": round(acc, 6), "n": n}
+        out["|".join(k)] = {"accuracy": round(acc, 6), "n": n}
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -26,22 +26,48 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from _script_utils import first_non_empty as _first
+from _script_utils import first_present as _first_present
+from _script_utils import intern_label as _intern
+
+_OUTCOME_KEYS = ("outcome", "result")
+_HOME_GOAL_KEYS = ("home_goals", "hg")
+_AWAY_GOAL_KEYS = ("away_goals", "ag")
+
+
+def _fadvise(f: Any, advice_name: str) -> None:
+    # Best-effort page-cache hint; posix_fadvise is Linux/Unix only.
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(f.fileno(), 0, 0, advice)
+    except OSError:
+        pass
 
 
 def iter_jsonl(path: Path) -> Iterable[Dict[str, Any]]:
     if not path.exists():
         return []
-    for ln in path.read_text(encoding="utf-8", errors="ignore").splitlines():
-        ln = ln.strip()
-        if not ln:
-            continue
+    # The prediction log is scanned once start-to-end: ask for aggressive read-ahead,
+    # then drop its pages so a large log does not evict other services' cache.
+    with path.open("r", encoding="utf-8", errors="ignore") as f:
+        _fadvise(f, "POSIX_FADV_SEQUENTIAL")
         try:
-            obj = json.loads(ln)
-            if isinstance(obj, dict):
-                yield obj
-        except Exception:
-            continue
+            for ln in f:
+                ln = ln.strip()
+                if not ln:
+                    continue
+                try:
+                    obj = json.loads(ln)
+                    if isinstance(obj, dict):
+                        yield obj
+                except Exception:
+                    continue
+        finally:
+            _fadvise(f, "POSIX_FADV_DONTNEED")
 
 
 def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
@@ -82,8 +108,8 @@ def norm_outcome(x: Any) -> Optional[str]:
 
 
 def outcome_from_goals(r: Dict[str, Any]) -> Optional[str]:
-    hg = r.get("home_goals", r.get("hg"))
-    ag = r.get("away_goals", r.get("ag"))
+    hg = _first_present(r, _HOME_GOAL_KEYS)
+    ag = _first_present(r, _AWAY_GOAL_KEYS)
     try:
         hg = int(hg)
         ag = int(ag)
@@ -142,6 +168,9 @@ def main() -> int:
 
     backtest_out.parent.mkdir(parents=True, exist_ok=True)
     joined = 0
+    # Joined records are kept in memory for step 2: backtest_events.jsonl is still
+    # written for build_similarity_buckets.py, but never parsed back here.
+    events: List[Dict[str, Any]] = []
 
     # 1) Join into backtest_events.jsonl
     with backtest_out.open("w", encoding="utf-8") as f:
@@ -151,7 +180,7 @@ def main() -> int:
                 continue
 
             r = results[mid]
-            actual = norm_outcome(r.get("outcome") or r.get("result")) or outcome_from_goals(r)
+            actual = norm_outcome(_first(r, _OUTCOME_KEYS)) or outcome_from_goals(r)
             if actual is None:
                 continue
 
@@ -177,16 +206,19 @@ def main() -> int:
                 "match_id": mid,
             }
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            events.append(rec)
             joined += 1
 
     # 2) Build buckets with Beta(a,b) smoothing
-    agg: Dict[str, Dict[str, float]] = {}
-    for r in iter_jsonl(backtest_out):
+    agg: Dict[Tuple[str, str, str, str], Dict[str, float]] = {}
+    for r in events:
         champ = str(r.get("championship") or "").strip()
         tier = str(r.get("tier") or "").strip()
         if not champ or not tier:
             continue
-        k = f"{champ}|{tier}|{bucketize_chaos(r.get('chaos_index'))}|{norm_fragility(r.get('fragility_level'))}"
+        chaos_b = bucketize_chaos(r.get("chaos_index"))
+        frag_n = norm_fragility(r.get("fragility_level"))
+        k = (_intern(champ), _intern(tier), _intern(chaos_b), _intern(frag_n))
         row = agg.setdefault(k, {"hits": 0.0, "n": 0.0})
         row["hits"] += 1.0 if bool(r.get("hit")) else 0.0
         row["n"] += 1.0
@@ -198,7 +230,7 @@ def main() -> int:
             continue
         hits = row["hits"]
         acc = (hits + prior_a) / (row["n"] + prior_a + prior_b)
-        out[k] = {"accuracy": round(acc, 6), "n": n, "smoothing": {"alpha": prior_a, "beta": prior_b}}
+        out["|".join(k)] = {"accuracy": round(acc, 6), "n": n, "smoothing": {"alpha": prior_a, "beta": prior_b}}
 
     buckets_out.parent.mkdir(parents=True, exist_ok=True)
     buckets_out.write_text(json.dumps(out, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import joblib
+
 from data_pipeline.train_1x2_models import (
     FOOTBALL_DATA_LEAGUE_TO_CHAMPIONSHIP,
     LEAGUES,
     _resolve_input_path,
+    _run_parallel,
+    _write_json,
     train_one_league,
     train_one_league_csv,
     train_one_league_local_calendar,
@@ -78,38 +81,49 @@ def main() -> None:
         calendar_path = _resolve_input_path(base_dir=base_dir, filename=str(args.calendar_file))
         leagues = _resolve_leagues(tokens)
         by_champ = {spec.championship: spec for spec in LEAGUES}
-        for champ in leagues:
-            league = by_champ[champ]
-            row = train_one_league_local_calendar(
-                league=league,
-                base_dir=base_dir,
-                calendar_path=calendar_path,
-                out_dir=out_dir,
-                split_ratio=split_ratio,
-                season_label=str(args.season_label),
-            )
-            all_metrics["leagues"][league.championship] = row
+        rows = _run_parallel(
+            [
+                joblib.delayed(train_one_league_local_calendar)(
+                    league=by_champ[champ],
+                    base_dir=base_dir,
+                    calendar_path=calendar_path,
+                    out_dir=out_dir,
+                    split_ratio=split_ratio,
+                    season_label=str(args.season_label),
+                )
+                for champ in leagues
+            ]
+        )
     elif str(args.source) == "csv":
         dataset_dir = (base_dir / str(args.dataset_dir)).resolve()
         season = int(args.season)
-        leagues = _resolve_csv_leagues(tokens)
-        for champ, code in leagues:
-            csv_path = dataset_dir / f"dataset_{code}_{season}.csv"
-            row = train_one_league_csv(championship=champ, csv_path=csv_path, out_dir=out_dir, split_ratio=split_ratio)
-            all_metrics["leagues"][champ] = row
+        csv_leagues = _resolve_csv_leagues(tokens)
+        leagues = [champ for champ, _ in csv_leagues]
+        rows = _run_parallel(
+            [
+                joblib.delayed(train_one_league_csv)(
+                    championship=champ,
+                    csv_path=dataset_dir / f"dataset_{code}_{season}.csv",
+                    out_dir=out_dir,
+                    split_ratio=split_ratio,
+                )
+                for champ, code in csv_leagues
+            ]
+        )
     else:
         leagues = _resolve_leagues(tokens)
         by_champ = {spec.championship: spec for spec in LEAGUES}
-        for champ in leagues:
-            league = by_champ[champ]
-            row = train_one_league(league=league, base_dir=base_dir, out_dir=out_dir, split_ratio=split_ratio)
-            all_metrics["leagues"][league.championship] = row
+        rows = _run_parallel(
+            [
+                joblib.delayed(train_one_league)(league=by_champ[champ], base_dir=base_dir, out_dir=out_dir, split_ratio=split_ratio)
+                for champ in leagues
+            ]
+        )
+    for champ, row in zip(leagues, rows):
+        all_metrics["leagues"][champ] = row
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    (out_dir / "metrics_1x2_all.json").write_text(
-        json.dumps(all_metrics, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    _write_json(out_dir / "metrics_1x2_all.json", all_metrics)
 
 
 if __name__ == "__main__":
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import importlib.util
 import json
 import math
+import os
 import re
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import joblib
 import numpy as np
 import pandas as pd
+import sklearn
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, log_loss
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
 
 
 @dataclass
@@ -34,6 +45,9 @@ LEAGUES: list[LeagueSpec] = [
 
 LABELS_1X2 = ["H", "D", "A"]
 
+# Elo expectation 1 / (1 + 10 ** (d / 400)) rewritten as exp(d * ln(10) / 400).
+_LN10_OVER_400 = math.log(10.0) / 400.0
+
 FOOTBALL_DATA_LEAGUE_TO_CHAMPIONSHIP: dict[str, str] = {
     "SA": "serie_a",
     "PL": "premier_league",
@@ -48,6 +62,9 @@ CALENDAR_SHEETS: dict[str, str] = {
     "bundesliga": "Bundesliga",
 }
 
+# Calendar score cells like "2-1", "2 – 1" (en dash) or "2:1".
+_SCORE_RE = re.compile(r"(\d{1,2})\s*[-–:]\s*(\d{1,2})")
+
 
 def _recency_weights(dates: pd.Series, *, half_life_days: float = 365.0) -> np.ndarray | None:
     if dates is None:
@@ -64,11 +81,42 @@ def _recency_weights(dates: pd.Series, *, half_life_days: float = 365.0) -> np.n
     return decay.to_numpy(dtype=float)
 
 
+def _finite_or_none(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite_or_none(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_or_none(v) for v in obj]
+    return obj
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    # NaN/Inf metrics are written as null (strict JSON) with or without orjson.
+    payload = _finite_or_none(payload)
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        return
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2, allow_nan=False), encoding="utf-8")
+
+
+def _dump_artifact(obj: Any, path: Path) -> None:
+    # Light zlib + pickle protocol 5: smaller files for bandwidth-bound cold loads while
+    # decompression stays cheap; joblib.load detects the compression transparently.
+    joblib.dump(obj, path, compress=("zlib", 3), protocol=5)
+
+
+def _feature_matrix(df: pd.DataFrame, feature_cols: list[str]) -> np.ndarray:
+    # float32 halves the memory traffic through imputer/scaler/lbfgs; a bare ndarray
+    # also skips sklearn's feature-name checks (inference passes ndarrays too).
+    return df[feature_cols].to_numpy(dtype=np.float32)
+
+
 def _fit_best_logit(
     *,
-    X_train: pd.DataFrame,
+    X_train: np.ndarray,
     y_train: np.ndarray,
-    X_test: pd.DataFrame,
+    X_test: np.ndarray,
     y_test: np.ndarray,
     sample_weight: np.ndarray | None,
 ) -> tuple[Pipeline, dict[str, Any], list[dict[str, Any]], np.ndarray]:
@@ -76,55 +124,127 @@ def _fit_best_logit(
     cw_grid = [None, "balanced"]
     trials: list[dict[str, Any]] = []
     best_ll = float("inf")
-    best_pipe = None
+    best_clf: LogisticRegression | None = None
     best_meta: dict[str, Any] = {}
     best_proba: np.ndarray | None = None
 
-    for C in c_grid:
-        for cw in cw_grid:
-            pipe = Pipeline(
-                steps=[
-                    ("imputer", SimpleImputer(strategy="median")),
-                    ("scaler", StandardScaler()),
-                    ("clf", LogisticRegression(max_iter=3000, multi_class="multinomial", C=C, class_weight=cw)),
-                ]
-            )
-            if sample_weight is not None:
-                pipe.fit(X_train, y_train, clf__sample_weight=sample_weight)
-            else:
-                pipe.fit(X_train, y_train)
-
-            proba0 = pipe.predict_proba(X_test)
-            clf = pipe.named_steps.get("clf") if hasattr(pipe, "named_steps") else None
-            classes = getattr(clf, "classes_", None)
-            proba = _reorder_proba_to_labels(proba=proba0, classes=classes, labels=LABELS_1X2)
-
-            ll = float(log_loss(y_test, proba, labels=LABELS_1X2))
-            acc = float(accuracy_score(y_test, pipe.predict(X_test)))
-            brier = float(_brier_multiclass(y_test, proba, LABELS_1X2))
-            score = float(ll + brier)
-            trials.append(
-                {
-                    "C": float(C),
-                    "class_weight": cw if cw is not None else "none",
-                    "accuracy": acc,
-                    "log_loss": ll,
-                    "brier": brier,
-                    "score": score,
-                }
-            )
-            if math.isfinite(ll) and ll < best_ll:
-                best_ll = ll
-                best_pipe = pipe
-                best_meta = {"C": float(C), "class_weight": cw if cw is not None else "none"}
-                best_proba = proba
-
-    if best_pipe is None or best_proba is None:
+    # Imputer and scaler do not depend on the grid point: fit them once and reuse the
+    # transformed matrices for every LogisticRegression instead of refitting a Pipeline.
+    imputer = SimpleImputer(strategy="median")
+    scaler = StandardScaler()
+    Z_train = scaler.fit_transform(imputer.fit_transform(X_train))
+    Z_test = scaler.transform(imputer.transform(X_test))
+
+    # A few thousand rows x 15 columns is far too small for threaded BLAS to pay off:
+    # pin it to one thread so the grid fits do not contend with other league workers.
+    with threadpool_limits(limits=1, user_api="blas"):
+        for C in c_grid:
+            for cw in cw_grid:
+                # Multinomial is the default for 3 classes (multi_class is deprecated); on
+                # standardized small data lbfgs converges well within 200 iterations at tol=1e-3.
+                clf = LogisticRegression(solver="lbfgs", max_iter=200, tol=1e-3, C=C, class_weight=cw)
+                clf.fit(Z_train, y_train, sample_weight=sample_weight)
+
+                proba0 = clf.predict_proba(Z_test)
+                proba = _reorder_proba_to_labels(proba=proba0, classes=clf.classes_, labels=LABELS_1X2)
+
+                ll = float(log_loss(y_test, proba, labels=LABELS_1X2))
+                acc = _accuracy_from_proba(y_test, proba, LABELS_1X2)
+                brier = float(_brier_multiclass(y_test, proba, LABELS_1X2))
+                score = float(ll + brier)
+                trials.append(
+                    {
+                        "C": float(C),
+                        "class_weight": cw if cw is not None else "none",
+                        "accuracy": acc,
+                        "log_loss": ll,
+                        "brier": brier,
+                        "score": score,
+                    }
+                )
+                if math.isfinite(ll) and ll < best_ll:
+                    best_ll = ll
+                    best_clf = clf
+                    best_meta = {"C": float(C), "class_weight": cw if cw is not None else "none"}
+                    best_proba = proba
+
+    if best_clf is None or best_proba is None:
         raise ValueError("train_failed")
 
+    # Steps are already fitted; the runtime only calls predict_proba on the saved pipeline.
+    best_pipe = Pipeline(steps=[("imputer", imputer), ("scaler", scaler), ("clf", best_clf)])
     return best_pipe, best_meta, trials, best_proba
 
 
+# Bump when the grid, estimator settings or cached tuple layout change.
+_FIT_CACHE_VERSION = 1
+
+
+def _fit_inputs_hash(
+    *,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    sample_weight: np.ndarray | None,
+) -> str:
+    h = hashlib.sha256(f"v{_FIT_CACHE_VERSION}|sklearn={sklearn.__version__}".encode("utf-8"))
+    for arr in (X_train, X_test, sample_weight):
+        if arr is None:
+            h.update(b"|none")
+            continue
+        a = np.ascontiguousarray(arr)
+        h.update(f"|{a.dtype.str}{a.shape}".encode("utf-8"))
+        h.update(a.data)
+    for labels in (y_train, y_test):
+        h.update(("|" + "\x1f".join(str(v) for v in labels)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _fit_best_logit_cached(
+    *,
+    cache_dir: Path,
+    championship: str,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    sample_weight: np.ndarray | None,
+) -> tuple[Pipeline, dict[str, Any], list[dict[str, Any]], np.ndarray]:
+    """``_fit_best_logit`` memoized on disk by a content hash of its inputs.
+
+    Re-running training on unchanged data reloads the tuned pipeline instead of
+    refitting the grid; any cache problem falls back to a fresh fit.
+    """
+    fit_kwargs = {"X_train": X_train, "y_train": y_train, "X_test": X_test, "y_test": y_test, "sample_weight": sample_weight}
+    key = _fit_inputs_hash(**fit_kwargs)
+    cache = cache_dir / f"logit_{championship}_{key[:24]}.joblib"
+    if cache.exists():
+        try:
+            payload = joblib.load(cache)
+            if isinstance(payload, dict) and payload.get("key") == key and isinstance(payload.get("result"), tuple):
+                return payload["result"]
+        except Exception:
+            pass
+
+    result = _fit_best_logit(**fit_kwargs)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        joblib.dump({"key": key, "result": result}, cache)
+        _prune_fit_cache(cache_dir=cache_dir, championship=championship, keep=cache)
+    except Exception:
+        pass
+    return result
+
+
+def _prune_fit_cache(*, cache_dir: Path, championship: str, keep: Path) -> None:
+    # Only the newest fit per championship can be hit again; older keys are dead weight.
+    pattern = re.compile(rf"logit_{re.escape(championship)}_[0-9a-f]{{24}}\.joblib")
+    for p in cache_dir.iterdir():
+        if p.name != keep.name and pattern.fullmatch(p.name):
+            p.unlink(missing_ok=True)
+
+
 def _resolve_input_path(*, base_dir: Path, filename: str) -> Path:
     p0 = (base_dir / filename).resolve()
     if p0.exists():
@@ -135,26 +255,32 @@ def _resolve_input_path(*, base_dir: Path, filename: str) -> Path:
     return p0
 
 
-def _safe_season_year(v: Any) -> int | None:
-    s = str(v or "").strip()
-    if not s:
-        return None
-    head = s.split("/")[0].strip()
-    if head.isdigit():
-        return int(head)
-    return None
+def _season_year_column(seasons: pd.Series) -> np.ndarray:
+    """Start year of each ``"2023/24"``-style season label, as floats.
+
+    NaN where the part before the first ``/`` is not a plain run of digits.
+    """
+    head = seasons.astype(str).str.split("/", n=1).str[0].str.strip()
+    head = head.where(head.str.fullmatch(r"\d+"))
+    return pd.to_numeric(head, errors="coerce").to_numpy(dtype=float)
+
+
+def _accuracy_from_proba(y_true: np.ndarray, proba: np.ndarray, labels: list[str]) -> float:
+    # Same argmax LogisticRegression.predict does, without a second pass through the pipeline.
+    pred = np.asarray(labels)[np.argmax(proba, axis=1)]
+    return float(accuracy_score(y_true, pred))
 
 
 def _brier_multiclass(y_true: np.ndarray, proba: np.ndarray, labels: list[str]) -> float:
     n = len(y_true)
     if n == 0:
         return float("nan")
-    idx = {lab: i for i, lab in enumerate(labels)}
+    codes = pd.Categorical(y_true, categories=labels).codes
+    valid = codes >= 0
     y = np.zeros_like(proba, dtype=float)
-    for r, lab in enumerate(y_true):
-        if lab in idx:
-            y[r, idx[lab]] = 1.0
-    return float(np.mean(np.sum((proba - y) ** 2, axis=1)))
+    y[np.flatnonzero(valid), codes[valid]] = 1.0
+    d = proba - y
+    return float(np.mean(np.einsum("ij,ij->i", d, d)))
 
 
 def _logit(p: np.ndarray) -> np.ndarray:
@@ -171,7 +297,7 @@ def _fit_platt_ovr(*, y_true: np.ndarray, proba: np.ndarray, labels: list[str])
         if int(y.sum()) == 0 or int(y.sum()) == int(len(y)):
             continue
         x = _logit(proba[:, i]).reshape(-1, 1)
-        clf = LogisticRegression(max_iter=1000)
+        clf = LogisticRegression(solver="lbfgs", max_iter=1000)
         clf.fit(x, y)
         coef = float(clf.coef_[0][0]) if hasattr(clf, "coef_") else 1.0
         intercept = float(clf.intercept_[0]) if hasattr(clf, "intercept_") else 0.0
@@ -184,7 +310,7 @@ def _fit_dirichlet_multiclass(*, y_true: np.ndarray, proba: np.ndarray, labels:
     # Riferimento concettuale: migliora probabilità tra classi rispetto a OVR.
     proba2 = np.clip(proba.astype(float), 1e-6, 1.0)
     X = np.log(proba2)
-    clf = LogisticRegression(max_iter=2000, multi_class="multinomial")
+    clf = LogisticRegression(solver="lbfgs", max_iter=2000)
     clf.fit(X, y_true)
     coef0 = clf.coef_.astype(float)
     intercept0 = clf.intercept_.astype(float)
@@ -306,119 +432,277 @@ def _points_for_result(ftr: str) -> tuple[int, int]:
     return 1, 1
 
 
-def _build_features(df: pd.DataFrame, *, window: int = 5) -> pd.DataFrame:
-    out = df.copy()
-    out["home_elo_pre"] = np.nan
-    out["away_elo_pre"] = np.nan
-    out["elo_diff"] = np.nan
-    out[f"home_pts_last{window}"] = np.nan
-    out[f"away_pts_last{window}"] = np.nan
-    out[f"home_gf_last{window}"] = np.nan
-    out[f"home_ga_last{window}"] = np.nan
-    out[f"away_gf_last{window}"] = np.nan
-    out[f"away_ga_last{window}"] = np.nan
-    out["home_days_rest"] = np.nan
-    out["away_days_rest"] = np.nan
-    out["rest_diff"] = np.nan
-
-    ratings: dict[str, float] = {}
-    hist: dict[str, list[tuple[datetime, int, int, int]]] = {}
-    last_played: dict[str, datetime] = {}
+def _elo_form_core(
+    *,
+    home_idx: list[int],
+    away_idx: list[int],
+    date_ns: list[int],
+    ftrs: list[str],
+    fthg: list[Any],
+    ftag: list[Any],
+    season_years: list[float],
+    n_teams: int,
+    window: int,
+) -> tuple[np.ndarray, ...]:
+    """Elo ratings, last-N form and rest days on integer team codes.
+
+    Per-team state lives in flat lists indexed by team code, so the loop does no
+    string hashing and no DataFrame access. Returns the twelve feature arrays in
+    the column order used by ``_build_features``.
+    """
+    n = len(home_idx)
+    home_elo_pre = np.full(n, np.nan)
+    away_elo_pre = np.full(n, np.nan)
+    elo_diff = np.full(n, np.nan)
+    home_pts = np.full(n, np.nan)
+    away_pts = np.full(n, np.nan)
+    home_gf = np.full(n, np.nan)
+    home_ga = np.full(n, np.nan)
+    away_gf = np.full(n, np.nan)
+    away_ga = np.full(n, np.nan)
+    home_rest = np.full(n, np.nan)
+    away_rest = np.full(n, np.nan)
+    rest_diff = np.full(n, np.nan)
 
     base_rating = 1500.0
     home_adv = 55.0
-
-    def k_for_season_year(season_year: int | None) -> float:
-        if season_year is None:
-            return 22.0
-        return 30.0 if season_year >= 2022 else 22.0
-
-    def expected(r_a: float, r_b: float) -> float:
-        return 1.0 / (1.0 + 10.0 ** ((r_b - r_a) / 400.0))
-
-    for i, r in out.iterrows():
-        h = str(r["HomeTeam"]).strip()
-        a = str(r["AwayTeam"]).strip()
-        dt = r["Date"]
-        if not isinstance(dt, datetime):
-            dt = pd.to_datetime(dt).to_pydatetime()
-
-        rh = float(ratings.get(h, base_rating))
-        ra = float(ratings.get(a, base_rating))
-        out.at[i, "home_elo_pre"] = rh
-        out.at[i, "away_elo_pre"] = ra
-        out.at[i, "elo_diff"] = rh - ra
-
-        def lastN(team: str) -> tuple[float, float, float]:
-            rows = hist.get(team, [])
-            if not rows:
-                return (float("nan"), float("nan"), float("nan"))
-            last = rows[-window:]
-            pts = sum(x[1] for x in last)
-            gf = sum(x[2] for x in last)
-            ga = sum(x[3] for x in last)
-            return (float(pts), float(gf), float(ga))
-
-        ph, gfh, gah = lastN(h)
-        pa, gfa, gaa = lastN(a)
-        out.at[i, f"home_pts_last{window}"] = ph
-        out.at[i, f"home_gf_last{window}"] = gfh
-        out.at[i, f"home_ga_last{window}"] = gah
-        out.at[i, f"away_pts_last{window}"] = pa
-        out.at[i, f"away_gf_last{window}"] = gfa
-        out.at[i, f"away_ga_last{window}"] = gaa
-
-        if h in last_played:
-            out.at[i, "home_days_rest"] = float((dt - last_played[h]).days)
-        if a in last_played:
-            out.at[i, "away_days_rest"] = float((dt - last_played[a]).days)
-        if pd.notna(out.at[i, "home_days_rest"]) and pd.notna(out.at[i, "away_days_rest"]):
-            out.at[i, "rest_diff"] = float(out.at[i, "home_days_rest"] - out.at[i, "away_days_rest"])
-
-        ftr = str(r["FTR"]).strip()
+    nan = float("nan")
+    exp = math.exp
+    no_form = (nan, nan, nan)
+
+    ratings: list[float] = [base_rating] * n_teams
+    last_played: list[int | None] = [None] * n_teams
+    ns_per_day = 86_400_000_000_000
+    # Last-N form as a ring buffer per team plus running (pts, gf, ga) totals:
+    # pushing a match is O(1) and reading the form is a plain list lookup.
+    recent: list[deque[tuple[int, int, int]]] = [deque(maxlen=window) for _ in range(n_teams)]
+    totals: list[tuple[int, int, int]] = [(0, 0, 0)] * n_teams
+    form: list[tuple[float, float, float]] = [no_form] * n_teams
+
+    def push(team: int, pts: int, gf: int, ga: int) -> None:
+        q = recent[team]
+        sp, sf, sa = totals[team]
+        if len(q) == window:
+            op, of, oa = q[0]
+            sp, sf, sa = sp - op, sf - of, sa - oa
+        q.append((pts, gf, ga))
+        sp, sf, sa = sp + pts, sf + gf, sa + ga
+        totals[team] = (sp, sf, sa)
+        form[team] = (float(sp), float(sf), float(sa))
+
+    for i in range(n):
+        h = home_idx[i]
+        a = away_idx[i]
+        dt = date_ns[i]
+
+        rh = ratings[h]
+        ra = ratings[a]
+        home_elo_pre[i] = rh
+        away_elo_pre[i] = ra
+        elo_diff[i] = rh - ra
+
+        home_pts[i], home_gf[i], home_ga[i] = form[h]
+        away_pts[i], away_gf[i], away_ga[i] = form[a]
+
+        lp_h = last_played[h]
+        lp_a = last_played[a]
+        # Floor division matches timedelta.days, so partial days round down as before.
+        hr = float((dt - lp_h) // ns_per_day) if lp_h is not None else nan
+        ar = float((dt - lp_a) // ns_per_day) if lp_a is not None else nan
+        home_rest[i] = hr
+        away_rest[i] = ar
+        if not (math.isnan(hr) or math.isnan(ar)):
+            rest_diff[i] = hr - ar
+
+        ftr = ftrs[i]
         if ftr not in {"H", "D", "A"}:
             continue
 
-        hg = r["FTHG"]
-        ag = r["FTAG"]
+        hg = fthg[i]
+        ag = ftag[i]
         if not isinstance(hg, (int, float)) or not isinstance(ag, (int, float)):
             continue
 
         pts_h, pts_a = _points_for_result(ftr)
-        hist.setdefault(h, []).append((dt, pts_h, int(hg), int(ag)))
-        hist.setdefault(a, []).append((dt, pts_a, int(ag), int(hg)))
+        push(h, pts_h, int(hg), int(ag))
+        push(a, pts_a, int(ag), int(hg))
         last_played[h] = dt
         last_played[a] = dt
 
-        season_year = _safe_season_year(r.get("Season"))
-        k = k_for_season_year(season_year)
-        exp_h = expected(rh + home_adv, ra)
+        season_year = season_years[i]
+        k = 30.0 if season_year >= 2022 else 22.0  # NaN (unknown season) -> 22
+        exp_h = 1.0 / (1.0 + exp(_LN10_OVER_400 * (ra - (rh + home_adv))))
         score_h = 1.0 if ftr == "H" else 0.0 if ftr == "A" else 0.5
         score_a = 1.0 - score_h if ftr != "D" else 0.5
         ratings[h] = rh + k * (score_h - exp_h)
         ratings[a] = ra + k * (score_a - (1.0 - exp_h))
 
-    out["season_year"] = out["Season"].apply(_safe_season_year).astype("float")
-    out["month"] = out["Date"].dt.month.astype("float")
-    out["weekday"] = out["Date"].dt.weekday.astype("float")
-    return out
+    return (
+        home_elo_pre,
+        away_elo_pre,
+        elo_diff,
+        home_pts,
+        away_pts,
+        home_gf,
+        home_ga,
+        away_gf,
+        away_ga,
+        home_rest,
+        away_rest,
+        rest_diff,
+    )
+
 
+def _build_features(df: pd.DataFrame, *, window: int = 5) -> pd.DataFrame:
+    n = len(df)
+    # Shared vocabulary for home and away sides: team -> dense integer code, with the
+    # name cleanup done column-wise instead of per row.
+    names = pd.concat([df["HomeTeam"], df["AwayTeam"]], ignore_index=True).astype(str).str.strip()
+    codes, teams = pd.factorize(names)
+    date_ns = pd.to_datetime(df["Date"]).to_numpy(dtype="datetime64[ns]").view("int64").tolist()
+    season_year = _season_year_column(df["Season"]) if "Season" in df.columns else np.full(n, np.nan)
+
+    (
+        home_elo_pre,
+        away_elo_pre,
+        elo_diff,
+        home_pts,
+        away_pts,
+        home_gf,
+        home_ga,
+        away_gf,
+        away_ga,
+        home_rest,
+        away_rest,
+        rest_diff,
+    ) = _elo_form_core(
+        home_idx=codes[:n].tolist(),
+        away_idx=codes[n:].tolist(),
+        date_ns=date_ns,
+        ftrs=df["FTR"].astype(str).str.strip().tolist(),
+        fthg=df["FTHG"].tolist(),
+        ftag=df["FTAG"].tolist(),
+        season_years=season_year.tolist(),
+        n_teams=len(teams),
+        window=window,
+    )
+
+    # All derived columns are assembled in one frame and attached with a single concat.
+    features = pd.DataFrame(
+        {
+            "home_elo_pre": home_elo_pre,
+            "away_elo_pre": away_elo_pre,
+            "elo_diff": elo_diff,
+            f"home_pts_last{window}": home_pts,
+            f"away_pts_last{window}": away_pts,
+            f"home_gf_last{window}": home_gf,
+            f"home_ga_last{window}": home_ga,
+            f"away_gf_last{window}": away_gf,
+            f"away_ga_last{window}": away_ga,
+            "home_days_rest": home_rest,
+            "away_days_rest": away_rest,
+            "rest_diff": rest_diff,
+            "season_year": season_year,
+            "month": df["Date"].dt.month.to_numpy(dtype=float),
+            "weekday": df["Date"].dt.weekday.to_numpy(dtype=float),
+        },
+        index=df.index,
+    )
+    base = df.drop(columns=[c for c in features.columns if c in df.columns])
+    return pd.concat([base, features], axis=1)
 
-def _load_league_xlsx(path: Path) -> pd.DataFrame:
+
+# Bump when the cleaning in _read_league_xlsx changes, so stale caches are ignored.
+_XLSX_CACHE_VERSION = 4
+
+# Only these columns feed the features; betting odds etc. are never parsed.
+_XLSX_COLUMNS = {"Season", "Date", "MatchDate", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR", "MatchID"}
+_XLSX_TEXT_COLUMNS = {"Season", "HomeTeam", "AwayTeam", "FTR"}
+_CALENDAR_COLUMNS = {"Giornata", "Data", "Casa", "Risultato", "Trasferta"}
+
+
+def _excel_engine() -> str | None:
+    # The Rust calamine reader is several times faster than openpyxl; pandas >= 2.2
+    # supports it when python-calamine is installed, otherwise keep pandas' default.
+    if importlib.util.find_spec("python_calamine") is None:
+        return None
+    major, minor = (int(x) for x in pd.__version__.split(".")[:2])
+    return "calamine" if (major, minor) >= (2, 2) else None
+
+
+_EXCEL_ENGINE = _excel_engine()
+
+
+def _xlsx_cache_path(cache_dir: Path, path: Path, tag: str) -> Path:
+    # One file per (workbook, tag): rewrites replace it in place when the source,
+    # cache version or pandas version changes.
+    source_id = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return cache_dir / "xlsx" / f"{path.stem}_{source_id}_{re.sub(r'[^A-Za-z0-9]+', '_', tag)}.joblib"
+
+
+def _cached_xlsx_frame(path: Path, tag: str, read: Callable[[], pd.DataFrame], *, cache_dir: Path) -> pd.DataFrame:
+    """Return ``read()``, reusing a cached parse while the workbook is unchanged.
+
+    Parsing XLSX dominates ingest time, so the frame is dumped under ``cache_dir`` and
+    keyed by the source mtime/size; any cache problem falls back to ``read()``.
+    """
+    cache = _xlsx_cache_path(cache_dir, path, tag)
+    try:
+        st = path.stat()
+        stamp = [int(st.st_mtime_ns), int(st.st_size)]
+    except OSError:
+        stamp = None
+    if stamp is not None and cache.exists():
+        try:
+            payload = joblib.load(cache)
+            if (
+                isinstance(payload, dict)
+                and payload.get("version") == _XLSX_CACHE_VERSION
+                and payload.get("pandas") == pd.__version__
+                and payload.get("source_stamp") == stamp
+                and isinstance(payload.get("df"), pd.DataFrame)
+            ):
+                return payload["df"]
+        except Exception:
+            pass
+
+    df = read()
+    if stamp is not None:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump({"version": _XLSX_CACHE_VERSION, "pandas": pd.__version__, "source_stamp": stamp, "df": df}, cache)
+        except Exception:
+            pass
+    return df
+
+
+def _load_league_xlsx(path: Path, *, cache_dir: Path) -> pd.DataFrame:
+    return _cached_xlsx_frame(path, "league", lambda: _read_league_xlsx(path), cache_dir=cache_dir)
+
+
+def _read_league_xlsx(path: Path) -> pd.DataFrame:
     need_sets = [
         {"Season", "Date", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"},
         {"Season", "MatchDate", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"},
     ]
 
-    header_row = 1
-    preview = pd.read_excel(path, header=None, nrows=6)
-    for i in range(len(preview)):
-        row = {str(x).strip() for x in preview.iloc[i].tolist() if str(x).strip() and str(x).strip() != "nan"}
-        if any(need.issubset(row) for need in need_sets):
-            header_row = i
-            break
-
-    df = pd.read_excel(path, header=header_row)
+    # Open the workbook once: the header probe and the full read share the parsed archive.
+    with pd.ExcelFile(path, engine=_EXCEL_ENGINE) as xls:
+        header_row = 1
+        preview = xls.parse(0, header=None, nrows=6)
+        for i in range(len(preview)):
+            row = {str(x).strip() for x in preview.iloc[i].tolist() if str(x).strip() and str(x).strip() != "nan"}
+            if any(need.issubset(row) for need in need_sets):
+                header_row = i
+                break
+
+        header = [str(x) for x in preview.iloc[header_row].tolist()] if header_row < len(preview) else []
+        df = xls.parse(
+            0,
+            header=header_row,
+            usecols=lambda c: str(c).strip() in _XLSX_COLUMNS,
+            dtype={c: str for c in header if c.strip() in _XLSX_TEXT_COLUMNS},
+        )
     df = df.rename(columns={c: str(c).strip() for c in df.columns})
     if "MatchDate" in df.columns and "Date" not in df.columns:
         df = df.rename(columns={"MatchDate": "Date"})
@@ -440,7 +724,7 @@ def _load_league_xlsx(path: Path) -> pd.DataFrame:
 
 def train_one_league(*, league: LeagueSpec, base_dir: Path, out_dir: Path, split_ratio: float) -> dict[str, Any]:
     src = _resolve_input_path(base_dir=base_dir, filename=league.source_xlsx)
-    df0 = _load_league_xlsx(src)
+    df0 = _load_league_xlsx(src, cache_dir=out_dir / "cache")
     df = _build_features(df0, window=5)
 
     feature_cols = [
@@ -461,24 +745,26 @@ def train_one_league(*, league: LeagueSpec, base_dir: Path, out_dir: Path, split
         "weekday",
     ]
 
-    X = df[feature_cols]
+    X = _feature_matrix(df, feature_cols)
     y = df["FTR"].to_numpy()
     n = len(df)
     split = int(math.floor(n * split_ratio))
     split = max(1, min(n - 1, split))
-    X_train, X_test = X.iloc[:split], X.iloc[split:]
+    X_train, X_test = X[:split], X[split:]
     y_train, y_test = y[:split], y[split:]
     train_dates = df["Date"].iloc[:split] if "Date" in df.columns else None
     sample_weight = _recency_weights(train_dates) if train_dates is not None else None
 
-    pipe, best_meta, trials, proba = _fit_best_logit(
+    pipe, best_meta, trials, proba = _fit_best_logit_cached(
+        cache_dir=out_dir / "cache",
+        championship=league.championship,
         X_train=X_train,
         y_train=y_train,
         X_test=X_test,
         y_test=y_test,
         sample_weight=sample_weight,
     )
-    acc = float(accuracy_score(y_test, pipe.predict(X_test)))
+    acc = _accuracy_from_proba(y_test, proba, LABELS_1X2)
     ll = float(log_loss(y_test, proba, labels=LABELS_1X2))
     brier = float(_brier_multiclass(y_test, proba, LABELS_1X2))
 
@@ -488,7 +774,7 @@ def train_one_league(*, league: LeagueSpec, base_dir: Path, out_dir: Path, split
     calibrator_path = out_dir / f"calibrator_1x2_{league.championship}.joblib"
     calibrator_path = out_dir / f"calibrator_1x2_{league.championship}.joblib"
 
-    joblib.dump(
+    _dump_artifact(
         {
             "pipeline": pipe,
             "feature_cols": feature_cols,
@@ -499,7 +785,7 @@ def train_one_league(*, league: LeagueSpec, base_dir: Path, out_dir: Path, split
     )
 
     calibrator = _choose_best_calibrator(y_true=y_test, proba=proba, labels=LABELS_1X2)
-    joblib.dump(
+    _dump_artifact(
         {
             "championship": league.championship,
             "generated_at_utc": datetime.utcnow().isoformat(),
@@ -527,79 +813,63 @@ def train_one_league(*, league: LeagueSpec, base_dir: Path, out_dir: Path, split
         "labels": LABELS_1X2,
         "generated_at_utc": datetime.utcnow().isoformat(),
     }
-    metrics_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_json(metrics_path, payload)
     return payload
 
 
-def _parse_score_cell(v: Any, *, date_is_past_or_today: bool) -> tuple[int, int] | None:
-    if v is None:
-        return None
-    if not date_is_past_or_today:
-        return None
-    s = str(v).strip()
-    if not s:
-        return None
-    m = re.search(r"(\d{1,2})\s*[-–:]\s*(\d{1,2})", s)
-    if not m:
-        return None
-    try:
-        return int(m.group(1)), int(m.group(2))
-    except Exception:
-        return None
-
-
-def _calendar_rows_to_df(*, calendar_path: Path, championship: str, season_label: str) -> pd.DataFrame:
+def _calendar_rows_to_df(*, calendar_path: Path, championship: str, season_label: str, cache_dir: Path) -> pd.DataFrame:
     sheet = CALENDAR_SHEETS.get(championship)
     if not sheet:
         raise ValueError("unsupported_championship")
-    df = pd.read_excel(calendar_path, sheet_name=sheet)
-    required = {"Giornata", "Data", "Casa", "Risultato", "Trasferta"}
+    # Only the raw sheet is cached: which scores count depends on today's date.
+    df = _cached_xlsx_frame(
+        calendar_path,
+        f"calendar_{sheet}",
+        lambda: pd.read_excel(
+            calendar_path,
+            sheet_name=sheet,
+            usecols=lambda c: str(c) in _CALENDAR_COLUMNS,
+            engine=_EXCEL_ENGINE,
+        ),
+        cache_dir=cache_dir,
+    )
+    required = _CALENDAR_COLUMNS
     if not required.issubset(set(df.columns)):
         raise ValueError("missing_columns:calendar")
 
-    rows: list[dict[str, Any]] = []
-    today = datetime.utcnow().date()
-    for i, r in df.iterrows():
-        home = str(r.get("Casa") or "").strip()
-        away = str(r.get("Trasferta") or "").strip()
-        if not home or not away:
-            continue
-        dt = pd.to_datetime(r.get("Data"), errors="coerce", dayfirst=True)
-        if pd.isna(dt):
-            continue
-        dt = dt.to_pydatetime()
-        md0 = r.get("Giornata")
-        md = int(md0) if isinstance(md0, (int, float)) and not (isinstance(md0, float) and math.isnan(md0)) else None
-        res = r.get("Risultato")
-        score = _parse_score_cell(res, date_is_past_or_today=(dt.date() <= today))
-        hg, ag, ftr = (None, None, "")
-        if score is not None:
-            hg, ag = score
-            if hg > ag:
-                ftr = "H"
-            elif hg < ag:
-                ftr = "A"
-            else:
-                ftr = "D"
-
-        rows.append(
-            {
-                "Season": season_label,
-                "Date": dt,
-                "HomeTeam": home,
-                "AwayTeam": away,
-                "FTHG": hg,
-                "FTAG": ag,
-                "FTR": ftr,
-                "Matchday": md,
-                "_row_id": int(i),
-            }
-        )
+    home = df["Casa"].fillna("").astype(str).str.strip()
+    away = df["Trasferta"].fillna("").astype(str).str.strip()
+    dates = pd.to_datetime(df["Data"], errors="coerce", dayfirst=True, format="mixed")
+    keep = (home != "") & (away != "") & dates.notna()
 
-    out = pd.DataFrame(rows)
-    out.sort_values(["Date", "_row_id"], inplace=True)
-    out.reset_index(drop=True, inplace=True)
-    return out
+    md = np.trunc(pd.to_numeric(df["Giornata"], errors="coerce"))
+    if md[keep].notna().all():
+        md = md.astype("float64").fillna(0).astype("int64")
+
+    # Scores only count for fixtures dated today or earlier.
+    today = pd.Timestamp(datetime.utcnow().date())
+    goals = df["Risultato"].fillna("").astype(str).str.strip().str.extract(_SCORE_RE)
+    hg = pd.to_numeric(goals[0], errors="coerce")
+    ag = pd.to_numeric(goals[1], errors="coerce")
+    scored = (hg.notna() & ag.notna() & (dates.dt.normalize() <= today)).to_numpy()
+    ftr = np.where(scored, np.select([hg > ag, hg < ag], ["H", "A"], "D"), "")
+
+    out = pd.DataFrame(
+        {
+            "Season": season_label,
+            "Date": dates,
+            "HomeTeam": home,
+            "AwayTeam": away,
+            "FTHG": hg.where(scored),
+            "FTAG": ag.where(scored),
+            "FTR": ftr,
+            "Matchday": md,
+            "_row_id": df.index.astype("int64"),
+        },
+        index=df.index,
+    )
+    out = out[keep.to_numpy()].sort_values(["Date", "_row_id"])
+    return out.reset_index(drop=True)
 
 
 def train_one_league_local_calendar(
@@ -612,8 +882,13 @@ def train_one_league_local_calendar(
     season_label: str,
 ) -> dict[str, Any]:
     hist_src = _resolve_input_path(base_dir=base_dir, filename=league.source_xlsx)
-    hist = _load_league_xlsx(hist_src)
-    cal = _calendar_rows_to_df(calendar_path=calendar_path, championship=league.championship, season_label=season_label)
+    hist = _load_league_xlsx(hist_src, cache_dir=out_dir / "cache")
+    cal = _calendar_rows_to_df(
+        calendar_path=calendar_path,
+        championship=league.championship,
+        season_label=season_label,
+        cache_dir=out_dir / "cache",
+    )
     df0 = pd.concat([hist, cal], ignore_index=True)
     df0.sort_values(["Date", "MatchID"] if "MatchID" in df0.columns else ["Date"], inplace=True)
     df0.reset_index(drop=True, inplace=True)
@@ -636,7 +911,7 @@ def train_one_league_local_calendar(
             "generated_at_utc": datetime.utcnow().isoformat(),
         }
         out_dir.mkdir(parents=True, exist_ok=True)
-        (out_dir / f"metrics_1x2_{league.championship}.json").write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_json(out_dir / f"metrics_1x2_{league.championship}.json", payload)
         return payload
 
     feature_cols = [
@@ -657,23 +932,25 @@ def train_one_league_local_calendar(
         "weekday",
     ]
 
-    X = df_season[feature_cols]
+    X = _feature_matrix(df_season, feature_cols)
     y = df_season["FTR"].to_numpy()
     split = int(math.floor(n * split_ratio))
     split = max(1, min(n - 1, split))
-    X_train, X_test = X.iloc[:split], X.iloc[split:]
+    X_train, X_test = X[:split], X[split:]
     y_train, y_test = y[:split], y[split:]
     train_dates = df_season["Date"].iloc[:split] if "Date" in df_season.columns else None
     sample_weight = _recency_weights(train_dates) if train_dates is not None else None
 
-    pipe, best_meta, trials, proba = _fit_best_logit(
+    pipe, best_meta, trials, proba = _fit_best_logit_cached(
+        cache_dir=out_dir / "cache",
+        championship=league.championship,
         X_train=X_train,
         y_train=y_train,
         X_test=X_test,
         y_test=y_test,
         sample_weight=sample_weight,
     )
-    acc = float(accuracy_score(y_test, pipe.predict(X_test)))
+    acc = _accuracy_from_proba(y_test, proba, LABELS_1X2)
     ll = float(log_loss(y_test, proba, labels=LABELS_1X2))
     brier = float(_brier_multiclass(y_test, proba, LABELS_1X2))
 
@@ -682,7 +959,7 @@ def train_one_league_local_calendar(
     metrics_path = out_dir / f"metrics_1x2_{league.championship}.json"
     calibrator_path = out_dir / f"calibrator_1x2_{league.championship}.joblib"
 
-    joblib.dump(
+    _dump_artifact(
         {
             "pipeline": pipe,
             "feature_cols": feature_cols,
@@ -693,7 +970,7 @@ def train_one_league_local_calendar(
     )
 
     calibrator = _choose_best_calibrator(y_true=y_test, proba=proba, labels=LABELS_1X2)
-    joblib.dump(
+    _dump_artifact(
         {
             "championship": league.championship,
             "generated_at_utc": datetime.utcnow().isoformat(),
@@ -721,7 +998,7 @@ def train_one_league_local_calendar(
         "labels": LABELS_1X2,
         "generated_at_utc": datetime.utcnow().isoformat(),
     }
-    metrics_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_json(metrics_path, payload)
     return payload
 
 
@@ -761,24 +1038,26 @@ def train_one_league_csv(*, championship: str, csv_path: Path, out_dir: Path, sp
     if not feature_cols:
         raise ValueError("no_numeric_features")
 
-    X = df[feature_cols]
+    X = _feature_matrix(df, feature_cols)
     y = df["result_1x2"].astype(str).to_numpy()
     n = len(df)
     split = int(math.floor(n * split_ratio))
     split = max(1, min(n - 1, split))
-    X_train, X_test = X.iloc[:split], X.iloc[split:]
+    X_train, X_test = X[:split], X[split:]
     y_train, y_test = y[:split], y[split:]
     train_dates = df["utc_date"].iloc[:split] if "utc_date" in df.columns else None
     sample_weight = _recency_weights(train_dates) if train_dates is not None else None
 
-    pipe, best_meta, trials, proba = _fit_best_logit(
+    pipe, best_meta, trials, proba = _fit_best_logit_cached(
+        cache_dir=out_dir / "cache",
+        championship=championship,
         X_train=X_train,
         y_train=y_train,
         X_test=X_test,
         y_test=y_test,
         sample_weight=sample_weight,
     )
-    acc = float(accuracy_score(y_test, pipe.predict(X_test)))
+    acc = _accuracy_from_proba(y_test, proba, LABELS_1X2)
     ll = float(log_loss(y_test, proba, labels=LABELS_1X2))
     brier = float(_brier_multiclass(y_test, proba, LABELS_1X2))
 
@@ -787,7 +1066,7 @@ def train_one_league_csv(*, championship: str, csv_path: Path, out_dir: Path, sp
     metrics_path = out_dir / f"metrics_1x2_{championship}.json"
     calibrator_path = out_dir / f"calibrator_1x2_{championship}.joblib"
 
-    joblib.dump(
+    _dump_artifact(
         {
             "pipeline": pipe,
             "feature_cols": feature_cols,
@@ -798,7 +1077,7 @@ def train_one_league_csv(*, championship: str, csv_path: Path, out_dir: Path, sp
     )
 
     calibrator = _choose_best_calibrator(y_true=y_test, proba=proba, labels=LABELS_1X2)
-    joblib.dump(
+    _dump_artifact(
         {
             "championship": championship,
             "generated_at_utc": datetime.utcnow().isoformat(),
@@ -826,10 +1105,20 @@ def train_one_league_csv(*, championship: str, csv_path: Path, out_dir: Path, sp
         "labels": LABELS_1X2,
         "generated_at_utc": datetime.utcnow().isoformat(),
     }
-    metrics_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_json(metrics_path, payload)
     return payload
 
 
+def _run_parallel(tasks: list[Any]) -> list[Any]:
+    """Run ``joblib.delayed`` league jobs in worker processes, results in task order."""
+    # Leagues are independent (own source file, own fit): one process per league up to
+    # the core count, splitting the cores between workers so BLAS does not oversubscribe.
+    cpu = os.cpu_count() or 1
+    n_jobs = max(1, min(len(tasks), cpu))
+    with joblib.parallel_config(backend="loky", inner_max_num_threads=max(1, cpu // n_jobs)):
+        return list(joblib.Parallel(n_jobs=n_jobs)(tasks))
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--out", type=str, default="data/models")
@@ -849,33 +1138,49 @@ def main() -> None:
     all_metrics: dict[str, Any] = {"generated_at_utc": datetime.utcnow().isoformat(), "leagues": {}}
     if str(args.source) == "local_calendar":
         calendar_path = _resolve_input_path(base_dir=base_dir, filename=str(args.calendar_file))
-        for league in LEAGUES:
-            row = train_one_league_local_calendar(
-                league=league,
-                base_dir=base_dir,
-                calendar_path=calendar_path,
-                out_dir=out_dir,
-                split_ratio=split_ratio,
-                season_label=str(args.season_label),
-            )
-            all_metrics["leagues"][league.championship] = row
+        champs = [league.championship for league in LEAGUES]
+        rows = _run_parallel(
+            [
+                joblib.delayed(train_one_league_local_calendar)(
+                    league=league,
+                    base_dir=base_dir,
+                    calendar_path=calendar_path,
+                    out_dir=out_dir,
+                    split_ratio=split_ratio,
+                    season_label=str(args.season_label),
+                )
+                for league in LEAGUES
+            ]
+        )
     elif str(args.source) == "csv":
         dataset_dir = (base_dir / str(args.dataset_dir)).resolve()
         season = int(args.season)
         leagues = [x.strip() for x in str(args.leagues).split(",") if x.strip()]
-        for code in leagues:
-            champ = FOOTBALL_DATA_LEAGUE_TO_CHAMPIONSHIP.get(code)
-            if not champ:
-                continue
-            csv_path = dataset_dir / f"dataset_{code}_{season}.csv"
-            row = train_one_league_csv(championship=champ, csv_path=csv_path, out_dir=out_dir, split_ratio=split_ratio)
-            all_metrics["leagues"][champ] = row
+        codes = [code for code in leagues if FOOTBALL_DATA_LEAGUE_TO_CHAMPIONSHIP.get(code)]
+        champs = [FOOTBALL_DATA_LEAGUE_TO_CHAMPIONSHIP[code] for code in codes]
+        rows = _run_parallel(
+            [
+                joblib.delayed(train_one_league_csv)(
+                    championship=champ,
+                    csv_path=dataset_dir / f"dataset_{code}_{season}.csv",
+                    out_dir=out_dir,
+                    split_ratio=split_ratio,
+                )
+                for champ, code in zip(champs, codes)
+            ]
+        )
     else:
-        for league in LEAGUES:
-            row = train_one_league(league=league, base_dir=base_dir, out_dir=out_dir, split_ratio=split_ratio)
-            all_metrics["leagues"][league.championship] = row
+        champs = [league.championship for league in LEAGUES]
+        rows = _run_parallel(
+            [
+                joblib.delayed(train_one_league)(league=league, base_dir=base_dir, out_dir=out_dir, split_ratio=split_ratio)
+                for league in LEAGUES
+            ]
+        )
+    for champ, row in zip(champs, rows):
+        all_metrics["leagues"][champ] = row
 
-    (out_dir / "metrics_1x2_all.json").write_text(json.dumps(all_metrics, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_json(out_dir / "metrics_1x2_all.json", all_metrics)
 
 
 if __name__ == "__main__":
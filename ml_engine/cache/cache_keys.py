@@ -4,14 +4,23 @@ import hashlib
 import json
 from typing import Any
 
+try:
+    from blake3 import blake3
+except ImportError:  # optional: keys fall back to hashlib SHA-256
+    blake3 = None
 
-def sha256_hex(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+def _key_hex(data: bytes) -> str:
+    # Cache keys are opaque: any 256-bit digest works, so prefer BLAKE3 (SIMD, several
+    # times faster on short inputs) when installed. Same 64-char hex width either way.
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
 
 
 def stable_json_hash(payload: dict[str, Any]) -> str:
     raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-    return sha256_hex(raw)
+    return _key_hex(raw.encode("utf-8"))
 
 
 def build_cache_key(
@@ -23,6 +32,5 @@ def build_cache_key(
     calibrator_version: str,
     inputs_hash: str,
 ) -> str:
-    key = f"{championship}|{match_id}|{model_version}|{feature_version}|{calibrator_version}|{inputs_hash}"
-    return sha256_hex(key)
-
+    parts = (championship, match_id, model_version, feature_version, calibrator_version, inputs_hash)
+    return _key_hex("|".join(parts).encode("utf-8"))
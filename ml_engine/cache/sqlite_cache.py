@@ -1,41 +1,249 @@
 from __future__ import annotations
 
+import atexit
 import json
+import math
+import os
 import sqlite3
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from ml_engine.resilience.circuit_breaker import CircuitOpenError, get_breaker
 from ml_engine.config import sqlite_busy_timeout_ms
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
 
 @dataclass(frozen=True)
 class CacheHit:
-    payload: dict[str, Any]
-    created_at: datetime
-    expires_at: datetime
+    payload_raw: Any = field(repr=False)
+    created_at_epoch: float
+    expires_at_epoch: int
     model_version: str | None
     feature_version: str | None
     calibrator_version: str | None
     inputs_hash: str | None
 
+    # Decoded on first access, so presence/freshness checks never pay for the JSON.
+    @cached_property
+    def payload(self) -> dict[str, Any]:
+        try:
+            payload = _loads_payload(self.payload_raw)
+        except Exception:
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
+    # Most callers only read the payload: build the datetimes on first access.
+    @cached_property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_epoch, tz=timezone.utc)
+
+    @cached_property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self.expires_at_epoch, tz=timezone.utc)
+
+
+# Connections are long-lived and per thread (sqlite3 handles must stay on the thread that
+# opened them), keyed by database path so the short-lived SqliteCache instances created
+# per request share them. Bumping a path's generation makes every thread reopen.
+_LOCAL = threading.local()
+_STATE_LOCK = threading.Lock()
+_GENERATIONS: dict[str, int] = {}
+_SCHEMA_READY: set[tuple[str, int]] = set()
+
+
+# Hot-path statements, kept as module constants so every call hands sqlite3 the same
+# text and hits its per-connection prepared-statement cache instead of re-parsing.
+_STATEMENT_CACHE_SIZE = 256
+_SQL_GET = """
+SELECT payload_json, created_at_epoch, expires_at_epoch, model_version, feature_version, calibrator_version, inputs_hash
+FROM predictions_cache
+WHERE cache_key = ?
+"""
+_SQL_SET = """
+INSERT OR REPLACE INTO predictions_cache (
+    cache_key, championship, match_id, matchday, payload_json, created_at, expires_at,
+    model_version, feature_version, calibrator_version, inputs_hash, expires_at_epoch, created_at_epoch
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_DELETE_KEY = "DELETE FROM predictions_cache WHERE cache_key = ?"
+_SQL_DELETE_EXPIRED = "DELETE FROM predictions_cache WHERE expires_at_epoch <= ? OR expires_at_epoch IS NULL"
+_SQL_METRICS_UPSERT = """
+INSERT INTO metrics_runtime (
+    day, route, count, err_count, latency_ms_sum, latency_ms_p50, latency_ms_p95, cache_hits, cache_misses
+) VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, ?)
+ON CONFLICT(day, route) DO UPDATE SET
+    count = count + excluded.count,
+    err_count = err_count + excluded.err_count,
+    latency_ms_sum = latency_ms_sum + excluded.latency_ms_sum,
+    cache_hits = cache_hits + excluded.cache_hits,
+    cache_misses = cache_misses + excluded.cache_misses
+"""
+
+
+def _dumps_payload(payload: dict[str, Any]) -> str | bytes:
+    if orjson is not None:
+        try:
+            # Stored as a BLOB in payload_json; SQLite keeps bytes as-is in a TEXT column.
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads_payload(raw: str | bytes | None) -> Any:
+    if not raw:
+        return {}
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# (payload_json, created_at_epoch, expires_at_epoch, model_version, feature_version, calibrator_version, inputs_hash)
+_Row = tuple[Any, float, int, "str | None", "str | None", "str | None", "str | None"]
+
+
+def _hit_from_row(row: _Row) -> CacheHit:
+    payload_json, created_at_epoch, expires_at_epoch, model_version, feature_version, calibrator_version, inputs_hash = row
+    return CacheHit(
+        payload_raw=payload_json,
+        created_at_epoch=created_at_epoch,
+        expires_at_epoch=expires_at_epoch,
+        model_version=model_version,
+        feature_version=feature_version,
+        calibrator_version=calibrator_version,
+        inputs_hash=inputs_hash,
+    )
+
+
+class _HotRows:
+    """Bounded LRU of recently read or written rows, keyed by (db path, cache key).
+
+    The payload stays serialized and is decoded on every hit, so callers never share
+    (and can freely mutate) the returned dicts. Each database has a generation that
+    ``clear`` bumps: rows read before a clear are dropped instead of re-inserted.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = int(maxsize)
+        self._lock = threading.Lock()
+        self._rows: OrderedDict[tuple[str, str], _Row] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def generation(self, db_key: str) -> int:
+        with self._lock:
+            return self._generations.get(db_key, 0)
+
+    def get(self, key: tuple[str, str]) -> _Row | None:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+            return row
+
+    def put(self, key: tuple[str, str], row: _Row, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._rows[key] = row
+            self._rows.move_to_end(key)
+            if len(self._rows) > self._maxsize:
+                self._rows.popitem(last=False)
+
+    def pop(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            self._rows.pop(key, None)
+
+    def clear(self, db_key: str) -> None:
+        with self._lock:
+            self._generations[db_key] = self._generations.get(db_key, 0) + 1
+            for key in [k for k in self._rows if k[0] == db_key]:
+                del self._rows[key]
+
+
+_HOT_ROWS = _HotRows(maxsize=2048)
+
+
+def _path_key(db_path: Path) -> str:
+    return os.path.abspath(str(db_path))
+
+
+def _invalidate_connections(db_path: Path) -> None:
+    key = _path_key(db_path)
+    with _STATE_LOCK:
+        _GENERATIONS[key] = _GENERATIONS.get(key, 0) + 1
+    _HOT_ROWS.clear(key)
+
 
 class SqliteCache:
     def __init__(self, *, db_path: Path) -> None:
         self._db_path = Path(db_path)
-        self._ensure_schema()
+        self._key = _path_key(self._db_path)
+        ready = (self._key, _GENERATIONS.get(self._key, 0))
+        if ready not in _SCHEMA_READY:
+            self._ensure_schema()
+            with _STATE_LOCK:
+                _SCHEMA_READY.add(ready)
 
-    def _connect(self) -> sqlite3.Connection:
+    def _open(self) -> sqlite3.Connection:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(self._db_path), timeout=3.0)
+        new_db = not self._db_path.exists()
+        # isolation_level="IMMEDIATE": the implicit transaction sqlite3 opens before any
+        # INSERT/UPDATE/DELETE takes the write lock up front (BEGIN IMMEDIATE) instead of
+        # upgrading a deferred read lock mid-transaction, which can fail with SQLITE_BUSY
+        # without consulting the busy handler. Plain SELECTs still run outside transactions.
+        conn = sqlite3.connect(
+            str(self._db_path), timeout=3.0, isolation_level="IMMEDIATE", cached_statements=_STATEMENT_CACHE_SIZE
+        )
+        if new_db:
+            # Page size only applies before the first write (switching to WAL is one).
+            conn.execute("PRAGMA page_size=8192;")
         conn.execute("PRAGMA journal_mode=WAL;")
         conn.execute("PRAGMA synchronous=NORMAL;")
         conn.execute("PRAGMA temp_store=MEMORY;")
         conn.execute(f"PRAGMA busy_timeout={int(sqlite_busy_timeout_ms())};")
+        # Read-heavy cache: serve hot pages from a memory map and a larger page cache
+        # (negative cache_size is KiB), and keep the WAL checkpointed at ~1000 pages.
+        conn.execute("PRAGMA mmap_size=268435456;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        conn.execute("PRAGMA wal_autocheckpoint=1000;")
         return conn
 
+    def _connect(self) -> sqlite3.Connection:
+        conns: dict[str, tuple[int, sqlite3.Connection]] | None = getattr(_LOCAL, "conns", None)
+        if conns is None:
+            conns = _LOCAL.conns = {}
+        gen = _GENERATIONS.get(self._key, 0)
+        entry = conns.get(self._key)
+        if entry is not None:
+            if entry[0] == gen:
+                return entry[1]
+            try:
+                entry[1].close()
+            except Exception:
+                pass
+        conn = self._open()
+        conns[self._key] = (gen, conn)
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection to the database; the next call reopens it."""
+        conns = getattr(_LOCAL, "conns", None)
+        entry = conns.pop(self._key, None) if conns else None
+        if entry is not None:
+            try:
+                entry[1].close()
+            except Exception:
+                pass
+
     def _ensure_schema(self) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -51,12 +259,28 @@ class SqliteCache:
                     model_version TEXT,
                     feature_version TEXT,
                     calibrator_version TEXT,
-                    inputs_hash TEXT
+                    inputs_hash TEXT,
+                    expires_at_epoch INTEGER,
+                    created_at_epoch REAL
                 )
                 """
             )
+            cols = {str(r[1]) for r in conn.execute("PRAGMA table_info(predictions_cache)")}
+            for col, decl, backfill in (
+                ("expires_at_epoch", "INTEGER", "CAST(strftime('%s', expires_at) AS INTEGER)"),
+                ("created_at_epoch", "REAL", "CAST(strftime('%s', created_at) AS REAL)"),
+            ):
+                if col in cols:
+                    continue
+                # Databases created before the epoch columns: backfill them from the ISO text.
+                try:
+                    conn.execute(f"ALTER TABLE predictions_cache ADD COLUMN {col} {decl}")
+                    conn.execute(f"UPDATE predictions_cache SET {col} = {backfill}")
+                except sqlite3.OperationalError:
+                    pass  # another process migrated it first
             conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_champ_md ON predictions_cache(championship, matchday)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_expires ON predictions_cache(expires_at)")
+            conn.execute("DROP INDEX IF EXISTS idx_predictions_expires")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_expires_epoch ON predictions_cache(expires_at_epoch)")
 
             conn.execute(
                 """
@@ -109,57 +333,64 @@ class SqliteCache:
 
     def get(self, *, cache_key: str, now_utc: datetime | None = None) -> CacheHit | None:
         now = now_utc or datetime.now(timezone.utc)
+        cache_key = str(cache_key)
+        hot_key = (self._key, cache_key)
+        row = _HOT_ROWS.get(hot_key)
+        if row is not None:
+            if row[2] > now.timestamp() and self._hot_rows_current():
+                return _hit_from_row(row)
+            _HOT_ROWS.pop(hot_key)
         try:
-            return get_breaker("sqlite_cache").call(self._get_impl, cache_key=str(cache_key), now=now)
+            return get_breaker("sqlite_cache").call(self._get_impl, cache_key=cache_key, now=now)
         except CircuitOpenError:
             return None
 
+    def _hot_rows_current(self) -> bool:
+        # Other processes (and other threads' connections) write the same file: PRAGMA
+        # data_version changes whenever another connection has committed since this
+        # connection last asked, so any such write drops this database's hot rows.
+        try:
+            conn = self._connect()
+            version = conn.execute("PRAGMA data_version;").fetchone()[0]
+        except sqlite3.Error:
+            return False
+        seen: dict[str, tuple[sqlite3.Connection, int]] | None = getattr(_LOCAL, "data_versions", None)
+        if seen is None:
+            seen = _LOCAL.data_versions = {}
+        prev = seen.get(self._key)
+        seen[self._key] = (conn, version)
+        if prev is not None and prev[0] is conn and prev[1] == version:
+            return True
+        _HOT_ROWS.clear(self._key)
+        return False
+
     def _get_impl(self, *, cache_key: str, now: datetime) -> CacheHit | None:
+        generation = _HOT_ROWS.generation(self._key)
         with self._connect() as conn:
             cur = conn.execute(
-                """
-                SELECT payload_json, created_at, expires_at, model_version, feature_version, calibrator_version, inputs_hash
-                FROM predictions_cache
-                WHERE cache_key = ?
-                """,
-                (str(cache_key),),
+                _SQL_GET,
+                (cache_key,),
             )
             row = cur.fetchone()
             if not row:
                 return None
-            payload_json, created_at, expires_at, model_version, feature_version, calibrator_version, inputs_hash = row
-            try:
-                exp_dt = datetime.fromisoformat(str(expires_at))
-            except Exception:
-                exp_dt = datetime.fromtimestamp(0, tz=timezone.utc)
-            if exp_dt.tzinfo is None:
-                exp_dt = exp_dt.replace(tzinfo=timezone.utc)
-            if exp_dt <= now:
-                conn.execute("DELETE FROM predictions_cache WHERE cache_key = ?", (str(cache_key),))
+            payload_json, created_at_epoch, expires_at_epoch, model_version, feature_version, calibrator_version, inputs_hash = row
+            now_epoch = now.timestamp()
+            if not isinstance(expires_at_epoch, int) or expires_at_epoch <= now_epoch:
+                conn.execute(_SQL_DELETE_KEY, (cache_key,))
                 return None
 
-            try:
-                c_dt = datetime.fromisoformat(str(created_at))
-            except Exception:
-                c_dt = now
-            if c_dt.tzinfo is None:
-                c_dt = c_dt.replace(tzinfo=timezone.utc)
-
-            try:
-                payload = json.loads(str(payload_json or "") or "{}")
-            except Exception:
-                payload = {}
-            if not isinstance(payload, dict):
-                payload = {}
-            return CacheHit(
-                payload=payload,
-                created_at=c_dt,
-                expires_at=exp_dt,
-                model_version=str(model_version) if model_version is not None else None,
-                feature_version=str(feature_version) if feature_version is not None else None,
-                calibrator_version=str(calibrator_version) if calibrator_version is not None else None,
-                inputs_hash=str(inputs_hash) if inputs_hash is not None else None,
-            )
+        hit_row: _Row = (
+            payload_json,
+            float(created_at_epoch) if isinstance(created_at_epoch, (int, float)) else now_epoch,
+            expires_at_epoch,
+            model_version,
+            feature_version,
+            calibrator_version,
+            inputs_hash,
+        )
+        _HOT_ROWS.put((self._key, cache_key), hit_row, generation)
+        return _hit_from_row(hit_row)
 
     def set(
         self,
@@ -210,34 +441,37 @@ class SqliteCache:
         inputs_hash: str,
         now: datetime,
     ) -> None:
-        ttl = int(ttl_seconds)
+        # set() has already coerced every argument; nothing is re-wrapped below.
+        ttl = ttl_seconds
         if ttl <= 0:
             return
-        expires_at = now.timestamp() + float(ttl)
-        exp_dt = datetime.fromtimestamp(expires_at, tz=timezone.utc)
-        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        created_at_epoch = now.timestamp()
+        # The epoch column is INTEGER: round up so an entry never expires before its TTL.
+        expires_at_epoch = math.ceil(created_at_epoch + ttl)
+        exp_dt = datetime.fromtimestamp(expires_at_epoch, tz=timezone.utc)
+        raw = _dumps_payload(payload)
+        generation = _HOT_ROWS.generation(self._key)
         with self._connect() as conn:
             conn.execute(
-                """
-                INSERT OR REPLACE INTO predictions_cache (
-                    cache_key, championship, match_id, matchday, payload_json, created_at, expires_at,
-                    model_version, feature_version, calibrator_version, inputs_hash
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_SET,
                 (
-                    str(cache_key),
-                    str(championship),
-                    str(match_id),
-                    int(matchday) if isinstance(matchday, int) else None,
-                    str(raw),
+                    cache_key,
+                    championship,
+                    match_id,
+                    matchday,
+                    raw,
                     now.isoformat(),
                     exp_dt.isoformat(),
-                    str(model_version),
-                    str(feature_version),
-                    str(calibrator_version),
-                    str(inputs_hash),
+                    model_version,
+                    feature_version,
+                    calibrator_version,
+                    inputs_hash,
+                    expires_at_epoch,
+                    created_at_epoch,
                 ),
             )
+        row: _Row = (raw, created_at_epoch, expires_at_epoch, model_version, feature_version, calibrator_version, inputs_hash)
+        _HOT_ROWS.put((self._key, cache_key), row, generation)
 
     def incr_runtime_metrics(
         self,
@@ -261,68 +495,118 @@ class SqliteCache:
             misses = 0
         if lat < 0:
             lat = 0.0
-        try:
-            get_breaker("sqlite_cache").call(
-                self._incr_runtime_metrics_impl,
-                day=d,
-                route=r,
-                latency_ms=float(lat),
-                err=int(err),
-                hits=int(hits),
-                misses=int(misses),
-            )
-        except CircuitOpenError:
-            return
+        _METRICS_BUFFER.add(db_path=self._key, day=d, route=r, latency_ms=lat, err=err, hits=hits, misses=misses)
+
+    def flush_runtime_metrics(self) -> None:
+        """Write buffered runtime-metric increments now instead of on the next batch tick."""
+        _METRICS_BUFFER.flush()
 
-    def _incr_runtime_metrics_impl(self, *, day: str, route: str, latency_ms: float, err: int, hits: int, misses: int) -> None:
+    def _write_runtime_metrics_impl(self, rows: list[tuple[str, str, int, int, float, int, int]]) -> None:
         with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO metrics_runtime (
-                    day, route, count, err_count, latency_ms_sum, latency_ms_p50, latency_ms_p95, cache_hits, cache_misses
-                ) VALUES (?, ?, 0, 0, 0.0, NULL, NULL, 0, 0)
-                """,
-                (str(day), str(route)),
-            )
-            conn.execute(
-                """
-                UPDATE metrics_runtime
-                SET
-                    count = count + 1,
-                    err_count = err_count + ?,
-                    latency_ms_sum = latency_ms_sum + ?,
-                    cache_hits = cache_hits + ?,
-                    cache_misses = cache_misses + ?
-                WHERE day = ? AND route = ?
-                """,
-                (int(err), float(latency_ms), int(hits), int(misses), str(day), str(route)),
+            # One UPSERT per (day, route) aggregate, all in a single transaction.
+            conn.executemany(
+                _SQL_METRICS_UPSERT,
+                rows,
             )
 
     def delete_expired(self, *, now_utc: datetime | None = None) -> int:
         now = now_utc or datetime.now(timezone.utc)
         try:
-            return int(get_breaker("sqlite_cache").call(self._delete_expired_impl, now_iso=now.isoformat()))
+            return int(get_breaker("sqlite_cache").call(self._delete_expired_impl, now_epoch=int(now.timestamp())))
         except CircuitOpenError:
             return 0
 
-    def _delete_expired_impl(self, *, now_iso: str) -> int:
+    def _delete_expired_impl(self, *, now_epoch: int) -> int:
+        _HOT_ROWS.clear(self._key)
         with self._connect() as conn:
-            cur = conn.execute("DELETE FROM predictions_cache WHERE expires_at <= ?", (str(now_iso),))
+            cur = conn.execute(_SQL_DELETE_EXPIRED, (now_epoch,))
             return int(cur.rowcount or 0)
 
 
+_METRICS_FLUSH_INTERVAL_S = 0.1
+_METRICS_FLUSH_MAX_PENDING = 64
+
+
+class _RuntimeMetricsBuffer:
+    """Aggregates runtime-metric increments in memory and writes them in batches.
+
+    Requests only bump in-memory counters; a daemon thread flushes them as one
+    transaction per database, ``_METRICS_FLUSH_INTERVAL_S`` after the first pending
+    increment or as soon as ``_METRICS_FLUSH_MAX_PENDING`` have queued up.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._has_data = threading.Event()
+        self._full = threading.Event()
+        self._pending: dict[tuple[str, str, str], list[Any]] = {}
+        self._n_pending = 0
+        self._thread: threading.Thread | None = None
+
+    def add(self, *, db_path: str, day: str, route: str, latency_ms: float, err: int, hits: int, misses: int) -> None:
+        key = (db_path, day, route)
+        with self._lock:
+            acc = self._pending.get(key)
+            if acc is None:
+                self._pending[key] = [1, err, latency_ms, hits, misses]
+            else:
+                acc[0] += 1
+                acc[1] += err
+                acc[2] += latency_ms
+                acc[3] += hits
+                acc[4] += misses
+            self._n_pending += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-metrics-flush", daemon=True)
+                self._thread.start()
+            self._has_data.set()
+            if self._n_pending >= _METRICS_FLUSH_MAX_PENDING:
+                self._full.set()
+
+    def _run(self) -> None:
+        while True:
+            self._has_data.wait()
+            self._full.wait(_METRICS_FLUSH_INTERVAL_S)
+            self._has_data.clear()
+            self._full.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending, self._n_pending = self._pending, {}, 0
+        by_db: dict[str, list[tuple[str, str, int, int, float, int, int]]] = {}
+        for (db, day, route), (count, err, lat, hits, misses) in batch.items():
+            by_db.setdefault(db, []).append((day, route, count, err, lat, hits, misses))
+        for db, rows in by_db.items():
+            try:
+                get_breaker("sqlite_cache").call(SqliteCache(db_path=Path(db))._write_runtime_metrics_impl, rows)
+            except Exception:
+                # Metrics are best effort: a failed batch is dropped, never retried into a hot loop.
+                pass
+
+
+_METRICS_BUFFER = _RuntimeMetricsBuffer()
+atexit.register(_METRICS_BUFFER.flush)
+
+
 def recover_corrupt_sqlite_db(*, db_path: Path) -> bool:
     p = Path(db_path)
+    _invalidate_connections(p)
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     moved_any = False
-    for suf in ["", "-wal", "-shm"]:
-        fp = Path(str(p) + suf)
-        if fp.exists():
-            try:
-                fp.rename(Path(str(fp) + f".bak.{ts}"))
-                moved_any = True
-            except Exception:
-                pass
+    names = {p.name, p.name + "-wal", p.name + "-shm"}
+    try:
+        # One directory read instead of an exists() stat per sidecar.
+        with os.scandir(p.parent) as it:
+            targets = [e.path for e in it if e.name in names]
+    except OSError:
+        targets = []
+    for fp in targets:
+        try:
+            os.replace(fp, f"{fp}.bak.{ts}")
+            moved_any = True
+        except OSError:
+            pass
     try:
         SqliteCache(db_path=p)
         return True
@@ -29,7 +29,11 @@ def _load_calibrator_cached(championship: str, artifact_dir: str) -> dict[str, A
         return None
     except Exception:
         return None
-    return payload if isinstance(payload, dict) else None
+    if not isinstance(payload, dict):
+        return None
+    # Parse once per load instead of on every calibrate_1x2 call.
+    payload["_compiled"] = _compile_calibrator(payload)
+    return payload
 
 
 def load_calibrator(championship: str) -> dict[str, Any] | None:
@@ -39,18 +43,74 @@ def load_calibrator(championship: str) -> dict[str, Any] | None:
 load_calibrator.cache_clear = _load_calibrator_cached.cache_clear  # type: ignore[attr-defined]
 
 
-def calibrate_1x2(*, championship: str, probs: dict[str, float]) -> tuple[dict[str, float], bool]:
-    calib = load_calibrator(championship)
-    if calib is None:
-        return probs, False
+def _compile_calibrator(calib: dict[str, Any]) -> tuple[str, Any] | None:
+    """Validate and coerce a calibrator payload into the tuples ``calibrate_1x2`` uses.
 
+    Returns ``("dirichlet", (coef_rows, intercept, eps))`` or ``("platt_ovr", {label: (coef,
+    intercept) | None})``; ``None`` when a Dirichlet payload is malformed.
+    """
     method = str(calib.get("method") or "platt_ovr").strip().lower()
     params = calib.get("params")
     if not isinstance(params, dict):
         params = {}
-    if method != "dirichlet" and not isinstance(params, dict):
+
+    if method == "dirichlet":
+        coef0 = params.get("coef") if "coef" in params else calib.get("coef")
+        intercept0 = params.get("intercept") if "intercept" in params else calib.get("intercept")
+        if not isinstance(coef0, list) or not isinstance(intercept0, list):
+            return None
+        try:
+            coef = tuple(tuple(float(x) for x in row) for row in coef0)
+            intercept = tuple(float(x) for x in intercept0)
+        except Exception:
+            return None
+        if len(coef) != 3 or any(len(row) != 3 for row in coef) or len(intercept) != 3:
+            return None
+        eps0 = params.get("eps") if "eps" in params else calib.get("eps")
+        eps = float(eps0) if isinstance(eps0, (int, float)) and float(eps0) > 0 else 1e-6
+        return "dirichlet", (coef, intercept, eps)
+
+    platt: dict[str, tuple[float, float] | None] = {}
+    for key in ("H", "D", "A"):
+        row = params.get(key)
+        coef1 = row.get("coef") if isinstance(row, dict) else None
+        intercept1 = row.get("intercept") if isinstance(row, dict) else None
+        if isinstance(coef1, (int, float)) and isinstance(intercept1, (int, float)):
+            platt[key] = (float(coef1), float(intercept1))
+        else:
+            platt[key] = None
+    return "platt_ovr", platt
+
+
+def _logit(p: float) -> float:
+    p = 1e-6 if p < 1e-6 else (1.0 - 1e-6 if p > 1.0 - 1e-6 else p)
+    return math.log(p / (1.0 - p))
+
+
+def _sigmoid(x: float) -> float:
+    if x < -60:
+        return 0.0
+    if x > 60:
+        x = 60
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+def _platt_one(row: tuple[float, float] | None, p: float) -> float:
+    if row is None:
+        return p
+    return _sigmoid(row[0] * _logit(p) + row[1])
+
+
+def calibrate_1x2(*, championship: str, probs: dict[str, float]) -> tuple[dict[str, float], bool]:
+    calib = load_calibrator(championship)
+    if calib is None:
         return probs, False
 
+    compiled = calib["_compiled"] if "_compiled" in calib else _compile_calibrator(calib)
+    if compiled is None:
+        return probs, False
+    method, spec = compiled
+
     p_h = float(probs.get("home_win", 0.0) or 0.0)
     p_d = float(probs.get("draw", 0.0) or 0.0)
     p_a = float(probs.get("away_win", 0.0) or 0.0)
@@ -61,71 +121,25 @@ def calibrate_1x2(*, championship: str, probs: dict[str, float]) -> tuple[dict[s
         p_h, p_d, p_a = max(p_h, 0.0) / s, max(p_d, 0.0) / s, max(p_a, 0.0) / s
 
     if method == "dirichlet":
-        coef0 = params.get("coef") if "coef" in params else calib.get("coef")
-        intercept0 = params.get("intercept") if "intercept" in params else calib.get("intercept")
-        if not isinstance(coef0, list) or not isinstance(intercept0, list):
-            return probs, False
-
-        try:
-            coef = [[float(x) for x in row] for row in coef0]
-            intercept = [float(x) for x in intercept0]
-        except Exception:
-            return probs, False
-
-        if len(coef) != 3 or any(len(row) != 3 for row in coef) or len(intercept) != 3:
-            return probs, False
-
-        eps0 = params.get("eps") if "eps" in params else calib.get("eps")
-        eps = float(eps0) if isinstance(eps0, (int, float)) and float(eps0) > 0 else 1e-6
-
-        def clamp(p: float) -> float:
-            if p < eps:
-                return eps
-            if p > 1.0:
-                return 1.0
-            return p
-
-        x0 = [math.log(clamp(p_h)), math.log(clamp(p_d)), math.log(clamp(p_a))]
-        z0 = [0.0, 0.0, 0.0]
-        for i in range(3):
-            srow = 0.0
-            row = coef[i]
-            for j in range(3):
-                srow += row[j] * x0[j]
-            z0[i] = srow + intercept[i]
-
-        m = max(z0)
-        e0 = [math.exp(z0[0] - m), math.exp(z0[1] - m), math.exp(z0[2] - m)]
+        (w_h, w_d, w_a), intercept, eps = spec
+        # softmax(W @ log(clamp(p)) + b), unrolled for the fixed 3x3 shape.
+        x_h = math.log(eps if p_h < eps else (1.0 if p_h > 1.0 else p_h))
+        x_d = math.log(eps if p_d < eps else (1.0 if p_d > 1.0 else p_d))
+        x_a = math.log(eps if p_a < eps else (1.0 if p_a > 1.0 else p_a))
+        z_h = w_h[0] * x_h + w_h[1] * x_d + w_h[2] * x_a + intercept[0]
+        z_d = w_d[0] * x_h + w_d[1] * x_d + w_d[2] * x_a + intercept[1]
+        z_a = w_a[0] * x_h + w_a[1] * x_d + w_a[2] * x_a + intercept[2]
+
+        m = max(z_h, z_d, z_a)
+        e0 = [math.exp(z_h - m), math.exp(z_d - m), math.exp(z_a - m)]
         s2 = e0[0] + e0[1] + e0[2]
         if s2 <= 0:
             return {"home_win": 1 / 3, "draw": 1 / 3, "away_win": 1 / 3}, True
         return {"home_win": e0[0] / s2, "draw": e0[1] / s2, "away_win": e0[2] / s2}, True
 
-    def logit(p: float) -> float:
-        p = 1e-6 if p < 1e-6 else (1.0 - 1e-6 if p > 1.0 - 1e-6 else p)
-        return math.log(p / (1.0 - p))
-
-    def sigmoid(x: float) -> float:
-        if x < -60:
-            return 0.0
-        if x > 60:
-            x = 60
-        return 1.0 / (1.0 + math.exp(-x))
-
-    def apply_one(key: str, p: float) -> float:
-        row = params.get(key)
-        if not isinstance(row, dict):
-            return p
-        coef = row.get("coef")
-        intercept = row.get("intercept")
-        if not isinstance(coef, (int, float)) or not isinstance(intercept, (int, float)):
-            return p
-        z = float(coef) * logit(p) + float(intercept)
-        return sigmoid(z)
-
-    ph2 = apply_one("H", p_h)
-    pd2 = apply_one("D", p_d)
-    pa2 = apply_one("A", p_a)
+    ph2 = _platt_one(spec["H"], p_h)
+    pd2 = _platt_one(spec["D"], p_d)
+    pa2 = _platt_one(spec["A"], p_a)
     s2 = max(ph2, 0.0) + max(pd2, 0.0) + max(pa2, 0.0)
     if s2 <= 0:
         return {"home_win": 1 / 3, "draw": 1 / 3, "away_win": 1 / 3}, True
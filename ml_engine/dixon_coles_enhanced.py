@@ -3,6 +3,8 @@ from __future__ import annotations
 import math
 from typing import Any
 
+from ml_engine.poisson_goal_model import poisson_pmf_vector
+
 
 def dc_correction(x: int, y: int, lam: float, mu: float, rho: float) -> float:
     if x == 0 and y == 0:
@@ -22,26 +24,41 @@ def poisson_pmf(k: int, lam: float) -> float:
     return math.exp(-lam) * (lam**k) / math.factorial(k)
 
 
-def dixon_coles_1x2(*, lam_home: float, lam_away: float, rho: float = 0.08, max_goals: int = 10) -> dict[str, Any]:
+def dixon_coles_1x2(
+    *,
+    lam_home: float,
+    lam_away: float,
+    rho: float = 0.08,
+    max_goals: int = 10,
+    pmf_home: list[float] | None = None,
+    pmf_away: list[float] | None = None,
+) -> dict[str, Any]:
+    n = max_goals + 1
+    px = pmf_home if pmf_home is not None else poisson_pmf_vector(lam_home, n)
+    py = pmf_away if pmf_away is not None else poisson_pmf_vector(lam_away, n)
+
+    # Independent-Poisson outcome sums in O(n) via the running away-goals CDF:
+    # P(home) = sum_x px[x] * P(Y < x), P(away) = sum_x px[x] * P(Y > x).
     p_home = 0.0
     p_draw = 0.0
     p_away = 0.0
+    total_y = sum(py)
+    below = 0.0
+    for x in range(n):
+        p_home += px[x] * below
+        p_draw += px[x] * py[x]
+        below += py[x]
+        p_away += px[x] * (total_y - below)
 
-    for x in range(max_goals + 1):
-        px = poisson_pmf(x, lam_home)
-        for y in range(max_goals + 1):
-            py = poisson_pmf(y, lam_away)
-            tau = dc_correction(x, y, lam_home, lam_away, rho)
-            p = tau * px * py
-            if x > y:
-                p_home += p
-            elif x == y:
-                p_draw += p
-            else:
-                p_away += p
+    # Dixon-Coles only reweights the four low-score cells; add (tau - 1) * p for each,
+    # with tau - 1 taken straight from dc_correction's 2x2 table (no per-cell branching).
+    p_draw -= px[0] * py[0] * (lam_home * lam_away * rho)
+    if n > 1:
+        p_away += px[0] * py[1] * (lam_home * rho)
+        p_home += px[1] * py[0] * (lam_away * rho)
+        p_draw -= px[1] * py[1] * rho
 
     s = p_home + p_draw + p_away
     if s <= 0:
         return {"home_win": 1 / 3, "draw": 1 / 3, "away_win": 1 / 3}
     return {"home_win": p_home / s, "draw": p_draw / s, "away_win": p_away / s}
-
@@ -2,15 +2,16 @@ from __future__ import annotations
 
 import json
 import math
-from pathlib import Path
+import time
+from functools import lru_cache
 from typing import Any
 
 from ml_engine.calibration_1x2 import calibrate_1x2
 from ml_engine.dixon_coles_enhanced import dixon_coles_1x2
 from ml_engine.features.builder import build_features_1x2
 from ml_engine.logit_1x2_runtime import predict_1x2
-from ml_engine.poisson_goal_model import match_probabilities
-from ml_engine.performance_targets import CHAMPIONSHIP_TARGETS
+from ml_engine.poisson_goal_model import match_probabilities, poisson_pmf_vector
+from ml_engine.performance_targets import CHAMPIONSHIP_PARAMS, DEFAULT_CHAMPIONSHIP_PARAMS
 from ml_engine.safety.safe_mode import get_safe_mode
 from ml_engine.team_ratings_store import get_team_strength
 from ml_engine.team_setpiece_store import get_team_setpieces
@@ -18,6 +19,26 @@ from ml_engine.team_territory_store import get_team_territory
 from ml_engine.config import monitoring_dir
 
 
+# Outcome keys of every probability dict, in (home, draw, away) order.
+_KEYS = ("home_win", "draw", "away_win")
+_UNIFORM3 = (1 / 3, 1 / 3, 1 / 3)
+
+# (w_base, w_poi, w_dc, w_logit) blends; matchdays 7-11 interpolate EARLY -> SETTLED.
+_WEIGHTS_LIVE = (0.20, 0.50, 0.25, 0.05)
+_WEIGHTS_NO_MATCHDAY = (0.35, 0.32, 0.23, 0.10)
+_WEIGHTS_EARLY = (0.25, 0.25, 0.20, 0.30)
+_WEIGHTS_SETTLED = (0.30, 0.35, 0.25, 0.10)
+
+
+def _interpolate_weights(md: int) -> tuple[float, float, float, float]:
+    t = (md - 6) / 6.0
+    w_base, w_poi, w_dc, w_logit = ((1.0 - t) * e + t * s for e, s in zip(_WEIGHTS_EARLY, _WEIGHTS_SETTLED))
+    return w_base, w_poi, w_dc, w_logit
+
+
+_WEIGHTS_MID = {md: _interpolate_weights(md) for md in range(7, 12)}
+
+
 class EnsemblePredictorService:
     def predict(self, *, championship: str, home_team: str, away_team: str, status: str, context: dict[str, Any]) -> dict[str, Any]:
         home_lookup = get_team_strength(championship=championship, team=home_team)
@@ -27,22 +48,24 @@ class EnsemblePredictorService:
 
         home_base = home_lookup.strength if home_lookup is not None else 0.0
         away_base = away_lookup.strength if away_lookup is not None else 0.0
-        target = CHAMPIONSHIP_TARGETS.get(championship, {})
-        home_adv = float(target.get("home_advantage", 0.12))
-        pace = float(target.get("pace_intensity", 0.0))
-        weather_impact = float(target.get("weather_impact", 0.0))
-        rho = float(target.get("dixon_coles_rho", 0.08))
+        target = CHAMPIONSHIP_PARAMS.get(championship, DEFAULT_CHAMPIONSHIP_PARAMS)
+        home_adv = target.home_advantage
+        pace = target.pace_intensity
+        weather_impact = target.weather_impact
+        rho = target.dixon_coles_rho
         live_bias = 0.0 if status != "LIVE" else 0.03
 
-        weather = context.get("weather", {})
-        weather_factor = 0.0
-        if isinstance(weather, dict):
-            wind = float(weather.get("wind_kmh", 0.0) or 0.0)
-            rain = float(weather.get("rain_mm", 0.0) or 0.0)
-            weather_factor = -weather_impact * (0.003 * wind + 0.006 * rain)
+        weather_factor = _weather_factor(context, weather_impact)
 
         x = (home_base - away_base) + home_adv + live_bias + weather_factor + 0.02 * pace
-        p_home_base, p_draw_base, p_away_base = _softmax3(x, 0.0, -x)
+        # Softmax over (x, 0, -x): the max is |x|, and exponents below -60 saturate to 0.
+        exp = math.exp
+        z_h, z_d, z_a = x - abs(x), -abs(x), -x - abs(x)
+        e_h = exp(z_h) if z_h >= -60 else 0.0
+        e_d = exp(z_d) if z_d >= -60 else 0.0
+        e_a = exp(z_a) if z_a >= -60 else 0.0
+        s_e = e_h + e_d + e_a
+        p_home_base, p_draw_base, p_away_base = e_h / s_e, e_d / s_e, e_a / s_e
 
         lam_home, lam_away = _expected_goals(
             home_base=home_base,
@@ -52,28 +75,23 @@ class EnsemblePredictorService:
             weather_factor=weather_factor,
         )
 
-        poisson = match_probabilities(lam_home=lam_home, lam_away=lam_away)
-        dc = dixon_coles_1x2(lam_home=lam_home, lam_away=lam_away, rho=rho)
+        poi_h, poi_d, poi_a, over_2_5, btts, dc_h, dc_d, dc_a = _goal_markets(lam_home, lam_away, rho)
 
         matchday = context.get("matchday")
         md: int | None = int(matchday) if isinstance(matchday, int) else None
         safe = get_safe_mode(championship)
 
         if status == "LIVE":
-            w_base, w_poi, w_dc, w_logit = 0.20, 0.50, 0.25, 0.05
+            w_base, w_poi, w_dc, w_logit = _WEIGHTS_LIVE
         else:
             if md is None:
-                w_base, w_poi, w_dc, w_logit = 0.35, 0.32, 0.23, 0.10
+                w_base, w_poi, w_dc, w_logit = _WEIGHTS_NO_MATCHDAY
             elif md <= 6:
-                w_base, w_poi, w_dc, w_logit = 0.25, 0.25, 0.20, 0.30
+                w_base, w_poi, w_dc, w_logit = _WEIGHTS_EARLY
             elif md >= 12:
-                w_base, w_poi, w_dc, w_logit = 0.30, 0.35, 0.25, 0.10
+                w_base, w_poi, w_dc, w_logit = _WEIGHTS_SETTLED
             else:
-                t = (md - 6) / 6.0
-                w_logit = (1.0 - t) * 0.30 + t * 0.10
-                w_base = (1.0 - t) * 0.25 + t * 0.30
-                w_poi = (1.0 - t) * 0.25 + t * 0.35
-                w_dc = (1.0 - t) * 0.20 + t * 0.25
+                w_base, w_poi, w_dc, w_logit = _WEIGHTS_MID[md]
 
         home_elo = home_lookup.meta.get("elo") if home_lookup is not None else None
         away_elo = away_lookup.meta.get("elo") if away_lookup is not None else None
@@ -87,14 +105,17 @@ class EnsemblePredictorService:
             if s_w > 0:
                 w_base, w_poi, w_dc = w_base / s_w, w_poi / s_w, w_dc / s_w
 
-        p_home = (w_base * p_home_base) + (w_poi * float(poisson["1x2"]["home_win"])) + (w_dc * float(dc["home_win"]))
-        p_draw = (w_base * p_draw_base) + (w_poi * float(poisson["1x2"]["draw"])) + (w_dc * float(dc["draw"]))
-        p_away = (w_base * p_away_base) + (w_poi * float(poisson["1x2"]["away_win"])) + (w_dc * float(dc["away_win"]))
+        poi_comp = {"home_win": poi_h, "draw": poi_d, "away_win": poi_a}
+        dc_comp = {"home_win": dc_h, "draw": dc_d, "away_win": dc_a}
+        # A convex blend of normalized components: already sums to 1 up to rounding, and
+        # calibrate_1x2 / _apply_guardrails renormalize downstream.
+        p_home = w_base * p_home_base + w_poi * poi_h + w_dc * dc_h
+        p_draw = w_base * p_draw_base + w_poi * poi_d + w_dc * dc_d
+        p_away = w_base * p_away_base + w_poi * poi_a + w_dc * dc_a
         if logit_available:
             p_home += w_logit * float(logit.get("home_win", 0.0))
             p_draw += w_logit * float(logit.get("draw", 0.0))
             p_away += w_logit * float(logit.get("away_win", 0.0))
-        p_home, p_draw, p_away = _normalize3(p_home, p_draw, p_away)
 
         events = context.get("events", [])
         if status == "LIVE" and isinstance(events, list):
@@ -109,12 +130,6 @@ class EnsemblePredictorService:
                     p_home, p_draw, p_away = p_home / s, p_draw / s, p_away / s
 
         base_comp = {"home_win": p_home_base, "draw": p_draw_base, "away_win": p_away_base}
-        poi_comp = {
-            "home_win": float(poisson["1x2"]["home_win"]),
-            "draw": float(poisson["1x2"]["draw"]),
-            "away_win": float(poisson["1x2"]["away_win"]),
-        }
-        dc_comp = {"home_win": float(dc["home_win"]), "draw": float(dc["draw"]), "away_win": float(dc["away_win"])}
         logit_comp = logit if logit_available else None
 
         probs0 = {"home_win": p_home, "draw": p_draw, "away_win": p_away}
@@ -130,38 +145,41 @@ class EnsemblePredictorService:
         elif missing_count == 1:
             shrink = 0.75
         if md is not None and status != "LIVE":
-            m_cap = int(target.get("early_season_matchday_cap", 12) or 12)
-            if m_cap < 6:
-                m_cap = 6
-            early_bonus = _clamp((float(m_cap) - float(md)) / float(m_cap), 0.0, 1.0) * 0.05
+            m_cap = float(target.early_season_matchday_cap)
+            early_bonus = _clamp((m_cap - float(md)) / m_cap, 0.0, 1.0) * 0.05
             shrink = _clamp(shrink + early_bonus, 0.0, 0.95)
-        if bool(safe.enabled) and shrink < 0.40:
+        if safe.enabled and shrink < 0.40:
             shrink = _clamp(shrink + 0.08, 0.0, 0.40)
+        # From here on every adjustment preserves the total (a mix with the uniform, or
+        # mass moved between home and away above a floor), so the only renormalization
+        # left is the one in _apply_guardrails after the final clip.
         if shrink > 0:
             u = 1.0 / 3.0
             p_home = (1.0 - shrink) * p_home + shrink * u
             p_draw = (1.0 - shrink) * p_draw + shrink * u
             p_away = (1.0 - shrink) * p_away + shrink * u
-            p_home, p_draw, p_away = _normalize3(p_home, p_draw, p_away)
 
         territory_explain: dict[str, Any] | None = None
+        # Territory and set-piece adjustments are pre-match only, but explain reports the
+        # meta of whichever side has data. When LIVE the away lookup is only needed if the
+        # home team had no entry.
+        is_live = status == "LIVE"
         home_tpx = get_team_territory(championship=championship, team=home_team)
-        away_tpx = get_team_territory(championship=championship, team=away_team)
-        if home_tpx is not None and away_tpx is not None and status != "LIVE":
-            home_edge = (float(home_tpx.off_index) - float(away_tpx.def_index)) / 100.0
-            away_edge = (float(away_tpx.off_index) - float(home_tpx.def_index)) / 100.0
-            net = float(home_edge - away_edge)
-            factor = 0.01 if not bool(safe.enabled) else 0.006
+        away_tpx = None if is_live and home_tpx is not None else get_team_territory(championship=championship, team=away_team)
+        if home_tpx is not None and away_tpx is not None and not is_live:
+            home_edge = (home_tpx.off_index - away_tpx.def_index) / 100.0
+            away_edge = (away_tpx.off_index - home_tpx.def_index) / 100.0
+            net = home_edge - away_edge
+            factor = 0.01 if not safe.enabled else 0.006
             raw_shift = _clamp(net * factor, -0.02, 0.02)
             floor = 0.02
             shift = raw_shift
             if shift > 0:
-                shift = min(float(shift), float(p_away) - floor)
+                shift = min(shift, p_away - floor)
             elif shift < 0:
-                shift = max(float(shift), floor - float(p_home))
-            p_home = float(p_home) + float(shift)
-            p_away = float(p_away) - float(shift)
-            p_home, p_draw, p_away = _normalize3(float(p_home), float(p_draw), float(p_away))
+                shift = max(shift, floor - p_home)
+            p_home += shift
+            p_away -= shift
 
             advantage = "none"
             if abs(net) >= 0.12:
@@ -169,42 +187,39 @@ class EnsemblePredictorService:
             territory_explain = {
                 "available": True,
                 "advantage": advantage,
-                "home": {"off_index": float(home_tpx.off_index), "def_index": float(home_tpx.def_index)},
-                "away": {"off_index": float(away_tpx.off_index), "def_index": float(away_tpx.def_index)},
-                "edges": {"home_vs_away_def": float(home_edge), "away_vs_home_def": float(away_edge), "net": float(net)},
-                "shift_applied": float(shift),
+                "home": {"off_index": home_tpx.off_index, "def_index": home_tpx.def_index},
+                "away": {"off_index": away_tpx.off_index, "def_index": away_tpx.def_index},
+                "edges": {"home_vs_away_def": home_edge, "away_vs_home_def": away_edge, "net": net},
+                "shift_applied": shift,
             }
         else:
             territory_explain = {"available": False}
 
         setpiece_explain: dict[str, Any] | None = None
         sp_home = get_team_setpieces(championship=championship, team=home_team)
-        sp_away = get_team_setpieces(championship=championship, team=away_team)
-        if sp_home is not None and sp_away is not None and status != "LIVE":
-            home_edge = (float(sp_home.off_index) - float(sp_away.def_index)) / 100.0
-            away_edge = (float(sp_away.off_index) - float(sp_home.def_index)) / 100.0
-            delta0 = float(home_edge - away_edge)
+        sp_away = None if is_live and sp_home is not None else get_team_setpieces(championship=championship, team=away_team)
+        if sp_home is not None and sp_away is not None and not is_live:
+            home_edge = (sp_home.off_index - sp_away.def_index) / 100.0
+            away_edge = (sp_away.off_index - sp_home.def_index) / 100.0
+            delta0 = home_edge - away_edge
 
             max_shift = 0.03
-            delta = _clamp(float(delta0) * 0.02, -float(max_shift), float(max_shift))
+            delta = _clamp(delta0 * 0.02, -max_shift, max_shift)
 
-            probs2 = _shift_home_away({"home_win": float(p_home), "draw": float(p_draw), "away_win": float(p_away)}, delta)
-            p_home = float(probs2.get("home_win", 0.0) or 0.0)
-            p_draw = float(probs2.get("draw", 0.0) or 0.0)
-            p_away = float(probs2.get("away_win", 0.0) or 0.0)
+            p_home, p_away = _shift_home_away(p_home, p_away, delta)
 
             setpiece_explain = {
                 "available": True,
-                "home_off": float(sp_home.off_index),
-                "home_def": float(sp_home.def_index),
-                "away_off": float(sp_away.off_index),
-                "away_def": float(sp_away.def_index),
-                "home_edge": round(float(home_edge), 4),
-                "away_edge": round(float(away_edge), 4),
-                "delta_applied": round(float(delta), 4),
-                "mismatch": bool(abs(float(home_edge - away_edge)) >= 0.25),
-                "home": {"off_index": float(sp_home.off_index), "def_index": float(sp_home.def_index)},
-                "away": {"off_index": float(sp_away.off_index), "def_index": float(sp_away.def_index)},
+                "home_off": sp_home.off_index,
+                "home_def": sp_home.def_index,
+                "away_off": sp_away.off_index,
+                "away_def": sp_away.def_index,
+                "home_edge": round(home_edge, 4),
+                "away_edge": round(away_edge, 4),
+                "delta_applied": round(delta, 4),
+                "mismatch": abs(home_edge - away_edge) >= 0.25,
+                "home": {"off_index": sp_home.off_index, "def_index": sp_home.def_index},
+                "away": {"off_index": sp_away.off_index, "def_index": sp_away.def_index},
             }
         else:
             setpiece_explain = {"available": False}
@@ -221,7 +236,7 @@ class EnsemblePredictorService:
             data_quality *= 0.85
         if not logit_available:
             data_quality *= 0.90
-        margin = _margin({"home_win": p_home, "draw": p_draw, "away_win": p_away})
+        margin = _margin(p_home, p_draw, p_away)
         confidence_raw = margin * (1.0 - var_ensemble) * data_quality
         confidence_score = _clamp(confidence_raw / 0.60, 0.0, 1.0)
         hi_thr, med_thr = _confidence_thresholds(championship=championship)
@@ -231,107 +246,100 @@ class EnsemblePredictorService:
             confidence_label = "MEDIUM"
         else:
             confidence_label = "LOW"
-        if bool(safe.enabled) and confidence_label == "HIGH":
+        if safe.enabled and confidence_label == "HIGH":
             confidence_label = "MEDIUM"
 
-        ranges = _probability_ranges(
-            probs={"home_win": p_home, "draw": p_draw, "away_win": p_away},
-            var_ensemble=var_ensemble,
-            data_quality=data_quality,
-        )
-        if bool(safe.enabled):
-            ranges = _widen_ranges(probs={"home_win": p_home, "draw": p_draw, "away_win": p_away}, ranges=ranges, factor=1.15)
+        # The helpers below take the final (home, draw, away) floats directly; dicts are
+        # only built for the response.
+        probs = (p_home, p_draw, p_away)
+        ranges = _probability_ranges(probs=probs, var_ensemble=var_ensemble, data_quality=data_quality)
+        if safe.enabled:
+            ranges = _widen_ranges(probs=probs, ranges=ranges, factor=1.15)
 
         explain = {
-            "feature_version": str(feature_version),
-            "missing_flags": dict(missing_flags),
-            "safe_mode": bool(safe.enabled),
+            "feature_version": feature_version,
+            "missing_flags": missing_flags,
+            "safe_mode": safe.enabled,
             "safe_mode_reason": safe.reason,
-            "championship_key_features": list(target.get("key_features", [])),
+            "championship_key_features": list(target.key_features),
             "components": {
-                "team_strength_delta": float(home_base - away_base),
+                "team_strength_delta": home_base - away_base,
                 "team_strength_source": "elo" if (not missing_home and not missing_away) else "neutral_missing",
-                "ratings_missing_home": bool(missing_home),
-                "ratings_missing_away": bool(missing_away),
+                "ratings_missing_home": missing_home,
+                "ratings_missing_away": missing_away,
                 "home_advantage": home_adv,
                 "pace_intensity": pace,
                 "weather_factor": weather_factor,
                 "status": status,
-                "lam_home": float(lam_home),
-                "lam_away": float(lam_away),
-                "probability_shrinkage": float(shrink),
-                "dixon_coles_rho": float(rho),
+                "lam_home": lam_home,
+                "lam_away": lam_away,
+                "probability_shrinkage": shrink,
+                "dixon_coles_rho": rho,
             },
             "ensemble_components": {
                 "base": base_comp,
                 "poisson": poi_comp,
                 "dixon_coles": dc_comp,
                 "logit": logit_comp,
-                "logit_available": bool(logit_available),
-                "calibrated": bool(calibrated),
+                "logit_available": logit_available,
+                "calibrated": calibrated,
             },
             "derived_markets": {
-                "over_2_5": float(poisson["goals"]["over_2_5"]),
-                "btts": float(poisson["goals"]["btts"]),
+                "over_2_5": over_2_5,
+                "btts": btts,
             },
-            "target_accuracy_range": target.get("accuracy_target"),
-            "confidence": {"score": float(confidence_score), "label": str(confidence_label)},
-            "ranges": ranges,
+            "target_accuracy_range": target.accuracy_target,
+            "confidence": {"score": confidence_score, "label": confidence_label},
         }
         if isinstance(territory_explain, dict):
             explain["territory"] = territory_explain
         if isinstance(setpiece_explain, dict):
             explain["set_pieces"] = setpiece_explain
-        if home_lookup is not None or away_lookup is not None:
-            meta0: dict[str, Any] = {}
-            if home_lookup is not None:
-                meta0.update(dict(home_lookup.meta))
-            elif away_lookup is not None:
-                meta0.update(dict(away_lookup.meta))
-            explain["ratings"] = meta0
-        if home_tpx is not None or away_tpx is not None:
-            meta1: dict[str, Any] = {}
-            if home_tpx is not None:
-                meta1.update(dict(home_tpx.meta))
-            elif away_tpx is not None:
-                meta1.update(dict(away_tpx.meta))
-            explain["territory_meta"] = meta1
-        if sp_home is not None or sp_away is not None:
-            meta2: dict[str, Any] = {}
-            if sp_home is not None:
-                meta2.update(dict(sp_home.meta))
-            elif sp_away is not None:
-                meta2.update(dict(sp_away.meta))
-            explain["setpiece_meta"] = meta2
+        # One shallow copy each: explain is handed to callers that may annotate it, and
+        # the lookup meta must not be aliased into it.
+        ratings_src = home_lookup if home_lookup is not None else away_lookup
+        if ratings_src is not None:
+            explain["ratings"] = dict(ratings_src.meta)
+        territory_src = home_tpx if home_tpx is not None else away_tpx
+        if territory_src is not None:
+            explain["territory_meta"] = dict(territory_src.meta)
+        setpiece_src = sp_home if sp_home is not None else sp_away
+        if setpiece_src is not None:
+            explain["setpiece_meta"] = dict(setpiece_src.meta)
 
         return {
             "probabilities": {"home_win": p_home, "draw": p_draw, "away_win": p_away},
             "ranges": ranges,
-            "confidence": {"score": float(confidence_score), "label": str(confidence_label)},
-            "confidence_score": float(confidence_score),
-            "confidence_label": str(confidence_label),
-            "feature_version": str(feature_version),
-            "safe_mode": bool(safe.enabled),
+            "confidence": {"score": confidence_score, "label": confidence_label},
+            "confidence_score": confidence_score,
+            "confidence_label": confidence_label,
+            "feature_version": feature_version,
+            "safe_mode": safe.enabled,
             "safe_mode_reason": safe.reason,
             "explain": explain,
         }
 
 
-def _softmax3(a: float, b: float, c: float) -> tuple[float, float, float]:
-    m = max(a, b, c)
-    ea, eb, ec = _exp(a - m), _exp(b - m), _exp(c - m)
-    s = ea + eb + ec
-    return ea / s, eb / s, ec / s
-
-
-def _exp(x: float) -> float:
-    if x < -60:
-        return 0.0
-    if x > 60:
-        x = 60
-    import math
-
-    return math.exp(x)
+@lru_cache(maxsize=4096)
+def _goal_markets(lam_home: float, lam_away: float, rho: float) -> tuple[float, float, float, float, float, float, float, float]:
+    # Pure in its arguments: re-scoring a fixture with unchanged ratings/context gives
+    # bit-identical rates and hits the cache. Both models share one pair of PMFs.
+    pmf_home = poisson_pmf_vector(lam_home, 11)
+    pmf_away = poisson_pmf_vector(lam_away, 11)
+    poisson = match_probabilities(lam_home=lam_home, lam_away=lam_away, pmf_home=pmf_home, pmf_away=pmf_away)
+    dc = dixon_coles_1x2(lam_home=lam_home, lam_away=lam_away, rho=rho, pmf_home=pmf_home, pmf_away=pmf_away)
+    poi_1x2 = poisson["1x2"]
+    goals = poisson["goals"]
+    return (
+        float(poi_1x2["home_win"]),
+        float(poi_1x2["draw"]),
+        float(poi_1x2["away_win"]),
+        goals["over_2_5"],
+        goals["btts"],
+        float(dc["home_win"]),
+        float(dc["draw"]),
+        float(dc["away_win"]),
+    )
 
 
 def _expected_goals(*, home_base: float, away_base: float, home_adv: float, pace: float, weather_factor: float) -> tuple[float, float]:
@@ -340,14 +348,16 @@ def _expected_goals(*, home_base: float, away_base: float, home_adv: float, pace
     return _clamp(lam_home, 0.20, 4.00), _clamp(lam_away, 0.20, 4.00)
 
 
-def _normalize3(a: float, b: float, c: float) -> tuple[float, float, float]:
-    a = max(a, 0.0)
-    b = max(b, 0.0)
-    c = max(c, 0.0)
-    s = a + b + c
-    if s <= 0:
-        return 1 / 3, 1 / 3, 1 / 3
-    return a / s, b / s, c / s
+def _weather_factor(context: dict[str, Any], weather_impact: float) -> float:
+    # Only weather-sensitive championships carry a non-zero impact; skip parsing for the rest.
+    if not weather_impact:
+        return 0.0
+    weather = context.get("weather")
+    if not isinstance(weather, dict):
+        return 0.0
+    wind = float(weather.get("wind_kmh") or 0.0)
+    rain = float(weather.get("rain_mm") or 0.0)
+    return -weather_impact * (0.003 * wind + 0.006 * rain)
 
 
 def _clamp(x: float, lo: float, hi: float) -> float:
@@ -355,102 +365,105 @@ def _clamp(x: float, lo: float, hi: float) -> float:
 
 
 def _apply_guardrails(p_home: float, p_draw: float, p_away: float) -> tuple[float, float, float]:
-    try:
-        p_home = float(p_home)
-        p_draw = float(p_draw)
-        p_away = float(p_away)
-    except Exception:
-        return (1 / 3, 1 / 3, 1 / 3)
-    if not (math.isfinite(p_home) and math.isfinite(p_draw) and math.isfinite(p_away)):
-        return (1 / 3, 1 / 3, 1 / 3)
+    # Inputs are floats; one isfinite on the sum catches any NaN/inf component.
+    if not math.isfinite(p_home + p_draw + p_away):
+        return _UNIFORM3
 
-    p_home = _clamp(p_home, 0.03, 0.90)
-    p_draw = _clamp(p_draw, 0.03, 0.90)
-    p_away = _clamp(p_away, 0.03, 0.90)
-    p_home, p_draw, p_away = _normalize3(p_home, p_draw, p_away)
-    return p_home, p_draw, p_away
+    p_home = 0.03 if p_home < 0.03 else 0.90 if p_home > 0.90 else p_home
+    p_draw = 0.03 if p_draw < 0.03 else 0.90 if p_draw > 0.90 else p_draw
+    p_away = 0.03 if p_away < 0.03 else 0.90 if p_away > 0.90 else p_away
+    # Every component is at least 0.03 after the clip, so the sum is positive.
+    s = p_home + p_draw + p_away
+    return p_home / s, p_draw / s, p_away / s
 
 
-def _shift_home_away(probs: dict[str, float], delta: float) -> dict[str, float]:
-    try:
-        p_home = float(probs.get("home_win", 0.0) or 0.0)
-        p_draw = float(probs.get("draw", 0.0) or 0.0)
-        p_away = float(probs.get("away_win", 0.0) or 0.0)
-    except Exception:
-        return {"home_win": 1 / 3, "draw": 1 / 3, "away_win": 1 / 3}
-
+def _shift_home_away(p_home: float, p_away: float, delta: float) -> tuple[float, float]:
+    """Move ``delta`` of probability from away to home (or back), keeping both above 0.02."""
     floor = 0.02
-    shift = float(delta)
+    shift = delta
     if shift > 0:
-        shift = min(float(shift), float(p_away) - float(floor))
+        shift = min(shift, p_away - floor)
     elif shift < 0:
-        shift = max(float(shift), float(floor) - float(p_home))
+        shift = max(shift, floor - p_home)
+    return p_home + shift, p_away - shift
 
-    p_home = float(p_home) + float(shift)
-    p_away = float(p_away) - float(shift)
-    p_home, p_draw, p_away = _normalize3(float(p_home), float(p_draw), float(p_away))
-    return {"home_win": float(p_home), "draw": float(p_draw), "away_win": float(p_away)}
 
-
-def _margin(probs: dict[str, float]) -> float:
-    v = sorted([float(probs.get("home_win", 0.0) or 0.0), float(probs.get("draw", 0.0) or 0.0), float(probs.get("away_win", 0.0) or 0.0)], reverse=True)
-    best = v[0] if v else 0.0
-    second = v[1] if len(v) > 1 else 0.0
+def _margin(p_home: float, p_draw: float, p_away: float) -> float:
+    # Top two of three by comparison; no list or sort needed.
+    best, second = (p_home, p_draw) if p_home >= p_draw else (p_draw, p_home)
+    if p_away > best:
+        best, second = p_away, best
+    elif p_away > second:
+        second = p_away
     return _clamp(best - second, 0.0, 1.0)
 
 
 def _ensemble_variance(*, base: dict[str, float], poisson: dict[str, float], dixon_coles: dict[str, float], logit: dict[str, float] | None) -> float:
-    comps: list[dict[str, float]] = [base, poisson, dixon_coles]
+    # base/poisson/dixon_coles are built in predict() with float values for every key;
+    # only the logit output needs the defensive lookup.
+    comps: list[tuple[float, float, float]] = [
+        (base["home_win"], base["draw"], base["away_win"]),
+        (poisson["home_win"], poisson["draw"], poisson["away_win"]),
+        (dixon_coles["home_win"], dixon_coles["draw"], dixon_coles["away_win"]),
+    ]
     if isinstance(logit, dict):
-        comps.append(logit)
-    if len(comps) <= 1:
-        return 0.0
+        comps.append(tuple(float(logit.get(k, 0.0) or 0.0) for k in _KEYS))
+    n = float(len(comps))
 
-    def var(vals: list[float]) -> float:
-        m = sum(vals) / float(len(vals))
-        return sum((x - m) ** 2 for x in vals) / float(len(vals))
+    total = 0.0
+    for vals in zip(*comps):
+        m = sum(vals) / n
+        total += sum((x - m) ** 2 for x in vals) / n
+    return _clamp(total / 3.0, 0.0, 1.0)
 
-    out_vars: list[float] = []
-    for k in ("home_win", "draw", "away_win"):
-        vals = [float(c.get(k, 0.0) or 0.0) for c in comps]
-        out_vars.append(var(vals))
-    return _clamp(sum(out_vars) / 3.0, 0.0, 1.0)
 
-
-def _probability_ranges(*, probs: dict[str, float], var_ensemble: float, data_quality: float) -> dict[str, dict[str, float]]:
+def _probability_ranges(*, probs: tuple[float, float, float], var_ensemble: float, data_quality: float) -> dict[str, dict[str, float]]:
     vol = _clamp(float(var_ensemble) * 2.0 + (1.0 - float(data_quality)) * 0.5, 0.0, 1.0)
-    k = 0.10 + 0.05 * vol
+    half = (0.10 + 0.05 * vol) * vol
 
     out: dict[str, dict[str, float]] = {}
-    for key in ("home_win", "draw", "away_win"):
-        p = float(probs.get(key, 1 / 3) or 0.0)
-        lo = _clamp(p - k * vol, 0.03, 0.90)
-        hi = _clamp(p + k * vol, 0.03, 0.90)
-        out[key] = {"lo": float(lo), "hi": float(hi)}
+    for key, p in zip(_KEYS, probs):
+        lo = p - half
+        hi = p + half
+        lo = 0.03 if lo < 0.03 else 0.90 if lo > 0.90 else lo
+        hi = 0.03 if hi < 0.03 else 0.90 if hi > 0.90 else hi
+        out[key] = {"lo": lo, "hi": hi}
     return out
 
 
-_CONF_CACHE: dict[str, Any] = {"path": None, "mtime_ns": None, "data": {}}
+# championship -> (monotonic time of last stat, path, mtime_ns, (high, med)). Within
+# _CONF_RECHECK_S of the last check the thresholds are served without touching the disk.
+_CONF_CACHE: dict[str, tuple[float, str, int | None, tuple[float, float]]] = {}
+_CONF_RECHECK_S = 2.0
+_CONF_DEFAULT = (0.70, 0.40)
 
 
 def _confidence_thresholds(*, championship: str) -> tuple[float, float]:
-    p = Path(monitoring_dir() / f"conf_thresholds_{championship}.json")
+    now = time.monotonic()
+    entry = _CONF_CACHE.get(championship)
+    if entry is not None and now - entry[0] < _CONF_RECHECK_S:
+        return entry[3]
+
+    p = monitoring_dir() / f"conf_thresholds_{championship}.json"
     try:
-        st = p.stat()
+        mtime_ns: int | None = p.stat().st_mtime_ns
     except Exception:
-        return 0.70, 0.40
-    if _CONF_CACHE.get("path") != str(p) or _CONF_CACHE.get("mtime_ns") != st.st_mtime_ns:
+        mtime_ns = None
+    if entry is not None and entry[1] == str(p) and entry[2] == mtime_ns:
+        thresholds = entry[3]
+    elif mtime_ns is None:
+        thresholds = _CONF_DEFAULT
+    else:
         try:
             raw = json.loads(p.read_text(encoding="utf-8"))
         except Exception:
             raw = None
-        if isinstance(raw, dict):
-            _CONF_CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": raw})
-        else:
-            _CONF_CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": {}})
-    data = _CONF_CACHE.get("data")
-    if not isinstance(data, dict):
-        return 0.70, 0.40
+        thresholds = _parse_conf_thresholds(raw if isinstance(raw, dict) else {})
+    _CONF_CACHE[championship] = (now, str(p), mtime_ns, thresholds)
+    return thresholds
+
+
+def _parse_conf_thresholds(data: dict[str, Any]) -> tuple[float, float]:
     hi = data.get("high")
     med = data.get("med")
     try:
@@ -468,20 +481,17 @@ def _confidence_thresholds(*, championship: str) -> tuple[float, float]:
     return hi_f, med_f
 
 
-def _widen_ranges(*, probs: dict[str, float], ranges: dict[str, dict[str, float]], factor: float) -> dict[str, dict[str, float]]:
+def _widen_ranges(*, probs: tuple[float, float, float], ranges: dict[str, dict[str, float]], factor: float) -> dict[str, dict[str, float]]:
     f = float(factor)
     if f <= 1.0:
         return ranges
     out: dict[str, dict[str, float]] = {}
-    for k in ("home_win", "draw", "away_win"):
-        r = ranges.get(k, {})
-        lo0 = float(r.get("lo", 0.03) or 0.03)
-        hi0 = float(r.get("hi", 0.90) or 0.90)
-        p = float(probs.get(k, 1 / 3) or 1 / 3)
-        w = max(hi0 - lo0, 0.0) * f
+    for k, p in zip(_KEYS, probs):
+        r = ranges[k]
+        w = max(r["hi"] - r["lo"], 0.0) * f
         lo = _clamp(p - 0.5 * w, 0.03, 0.90)
         hi = _clamp(p + 0.5 * w, 0.03, 0.90)
         if hi < lo:
             lo, hi = hi, lo
-        out[k] = {"lo": float(lo), "hi": float(hi)}
+        out[k] = {"lo": lo, "hi": hi}
     return out
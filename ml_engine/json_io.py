@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used when orjson is not installed
+    orjson = None
+
+
+def loads_json_bytes(raw: bytes) -> Any:
+    """Parse a UTF-8 JSON document, with orjson when it is installed.
+
+    orjson rejects the NaN/Infinity literals ``json.dumps`` emits by default, so a
+    document it refuses is retried with the stdlib parser before the error surfaces.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode("utf-8"))
@@ -7,6 +7,11 @@ from typing import Any
 
 import joblib
 
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # optional: sklearn pipelines also accept nested lists
+    np = None
+
 from ml_engine.resilience.circuit_breaker import CircuitOpenError, get_breaker
 
 
@@ -18,13 +23,6 @@ def _joblib_load(path: str) -> Any:
     return get_breaker("artifacts").call(joblib.load, path)
 
 
-def _is_finite_number(v: Any) -> bool:
-    try:
-        return math.isfinite(float(v))
-    except Exception:
-        return False
-
-
 @lru_cache(maxsize=32)
 def _load_model_cached(championship: str, artifact_dir: str) -> dict[str, Any] | None:
     path = os.path.join(artifact_dir, f"model_1x2_{championship}.joblib")
@@ -40,9 +38,77 @@ def _load_model_cached(championship: str, artifact_dir: str) -> dict[str, Any] |
         return None
     if "pipeline" not in payload or "feature_cols" not in payload:
         return None
+    feature_cols = payload.get("feature_cols")
+    # Column names are fixed per artifact: normalize them once here, not per prediction.
+    payload["_cols"] = tuple(str(c) for c in feature_cols) if isinstance(feature_cols, list) else ()
+    payload["_linear"] = _compile_linear(payload.get("pipeline"), len(payload["_cols"]))
+    payload["_class_slots"] = _class_slots(payload.get("pipeline"), payload.get("labels"))
     return payload
 
 
+_CLASS_KEYS = {"H": "home_win", "D": "draw", "A": "away_win"}
+
+
+def _class_slots(pipe: Any, labels: Any) -> tuple[tuple[int, str], ...]:
+    """Map ``predict_proba`` columns to outcome keys as ``((column, key), ...)``.
+
+    Columns follow the fitted ``classes_`` (sorted, so "A", "D", "H" for sklearn), not the
+    training ``labels`` order; the labels are only a fallback for estimators without them.
+    """
+    classes = getattr(pipe, "classes_", None)
+    if classes is None and hasattr(pipe, "named_steps"):
+        classes = getattr(pipe.named_steps.get("clf"), "classes_", None)
+    if classes is None:
+        classes = labels
+    if classes is None or isinstance(classes, (str, bytes)) or not hasattr(classes, "__iter__"):
+        return ()
+    return tuple((i, _CLASS_KEYS[str(c)]) for i, c in enumerate(classes) if str(c) in _CLASS_KEYS)
+
+
+def _compile_linear(pipe: Any, n_features: int) -> tuple[Any, ...] | None:
+    """Flatten an imputer -> scaler -> multinomial logistic pipeline into plain floats.
+
+    ``predict_proba`` on a one-row input spends far longer in sklearn's validation and
+    dispatch than in the 15x3 matvec itself. Returns ``(fill, mean, scale, coef,
+    intercept)`` as tuples, or None for any other pipeline shape, which keeps using
+    ``predict_proba``.
+    """
+    steps = getattr(pipe, "steps", None)
+    if not isinstance(steps, list) or [name for name, _ in steps] != ["imputer", "scaler", "clf"]:
+        return None
+    imputer, scaler, clf = (step for _, step in steps)
+    if type(imputer).__name__ != "SimpleImputer" or type(scaler).__name__ != "StandardScaler" or type(clf).__name__ != "LogisticRegression":
+        return None
+    try:
+        fill = tuple(float(v) for v in imputer.statistics_)
+        mean = tuple(float(v) for v in scaler.mean_) if scaler.with_mean else (0.0,) * n_features
+        scale = tuple(float(v) for v in scaler.scale_) if scaler.with_std else (1.0,) * n_features
+        coef = tuple(tuple(float(v) for v in row) for row in clf.coef_)
+        intercept = tuple(float(v) for v in clf.intercept_)
+        is_nan_marker = isinstance(imputer.missing_values, float) and math.isnan(imputer.missing_values)
+    except Exception:
+        return None
+    # One-vs-rest, binary, or an imputer that dropped all-empty columns: not a plain softmax over n_features.
+    if getattr(clf, "multi_class", "deprecated") not in ("deprecated", "multinomial", "auto") or getattr(clf, "solver", "") == "liblinear":
+        return None
+    if len(coef) < 3 or not is_nan_marker or getattr(imputer, "add_indicator", False) or any(math.isnan(v) for v in fill):
+        return None
+    if not all(len(v) == n_features for v in (fill, mean, scale, *coef)):
+        return None
+    return fill, mean, scale, coef, intercept
+
+
+def _linear_proba(linear: tuple[Any, ...], row: list[float]) -> list[float]:
+    fill, mean, scale, coef, intercept = linear
+    z = [(fill[i] if v != v else v) - mean[i] for i, v in enumerate(row)]
+    z = [v / scale[i] for i, v in enumerate(z)]
+    logits = [sum(w * x for w, x in zip(ws, z)) + b for ws, b in zip(coef, intercept)]
+    m = max(logits)
+    e = [math.exp(v - m) for v in logits]
+    s = sum(e)
+    return [v / s for v in e]
+
+
 def load_model(championship: str) -> dict[str, Any] | None:
     return _load_model_cached(championship, _default_artifact_dir())
 
@@ -50,66 +116,63 @@ def load_model(championship: str) -> dict[str, Any] | None:
 load_model.cache_clear = _load_model_cached.cache_clear  # type: ignore[attr-defined]
 
 
+def _feature_row(features: dict[str, Any], cols: tuple[str, ...]) -> list[float]:
+    # build_features_1x2 already emits the schema's columns in order as floats, so the
+    # common case is a single pass over the values; anything else takes the keyed path.
+    if len(features) == len(cols) and tuple(features) == cols:
+        isfinite = math.isfinite
+        try:
+            return [float(v) if isfinite(v) else math.nan for v in features.values()]
+        except (TypeError, OverflowError):
+            pass
+    row: list[float] = []
+    for col in cols:
+        v = features.get(col)
+        try:
+            f = float(v) if isinstance(v, (int, float)) else math.nan
+        except OverflowError:  # an int too large for a float
+            f = math.nan
+        row.append(f if math.isfinite(f) else math.nan)
+    return row
+
+
 def predict_1x2(*, championship: str, features: dict[str, Any]) -> dict[str, float] | None:
     payload = load_model(championship)
     if payload is None:
         return None
 
     pipe = payload.get("pipeline")
-    feature_cols = payload.get("feature_cols")
-    if not isinstance(feature_cols, list) or not feature_cols:
+    cols = payload.get("_cols")
+    slots = payload.get("_class_slots")
+    if not cols or not slots:
         return None
 
-    row: list[float] = []
-    cols = [str(c) for c in feature_cols]
-    for col in cols:
-        v = features.get(col)
-        if isinstance(v, (int, float)) and _is_finite_number(v):
-            row.append(float(v))
-        else:
-            row.append(float("nan"))
-    try:
-        import numpy as np  # type: ignore[import-not-found]
-
-        X: Any = np.asarray([row], dtype=float)
-    except Exception:
-        X = [row]
-
-    try:
-        proba = pipe.predict_proba(X)
-    except Exception:
-        return None
+    row = _feature_row(features, cols)
+    linear = payload.get("_linear")
+    if linear is not None:
+        proba: Any = [_linear_proba(linear, row)]
+    else:
+        X: Any = np.array([row], dtype=float) if np is not None else [row]
+        try:
+            proba = pipe.predict_proba(X)
+        except Exception:
+            return None
     if not hasattr(proba, "__len__") or len(proba) != 1:
         return None
     row0 = proba[0]
     if not hasattr(row0, "__len__"):
         return None
 
-    classes = getattr(pipe, "classes_", None)
-    if not isinstance(classes, (list, tuple)):
-        clf = getattr(pipe, "named_steps", {}).get("clf") if hasattr(pipe, "named_steps") else None
-        classes = getattr(clf, "classes_", None)
-    if not isinstance(classes, (list, tuple)):
-        classes = payload.get("labels")
-    if not isinstance(classes, (list, tuple)):
-        return None
-
     out: dict[str, float] = {"home_win": 0.0, "draw": 0.0, "away_win": 0.0}
-    for i, c in enumerate(list(classes)):
-        if i >= len(row0):
+    n = len(row0)
+    for i, key in slots:
+        if i >= n:
             break
         try:
             p = float(row0[i])
         except Exception:
             p = 0.0
-        if not _is_finite_number(p):
-            p = 0.0
-        if str(c) == "H":
-            out["home_win"] = p
-        elif str(c) == "D":
-            out["draw"] = p
-        elif str(c) == "A":
-            out["away_win"] = p
+        out[key] = p if math.isfinite(p) else 0.0
 
     s = max(out["home_win"], 0.0) + max(out["draw"], 0.0) + max(out["away_win"], 0.0)
     if s <= 0:
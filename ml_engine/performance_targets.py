@@ -1,3 +1,9 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
 CHAMPIONSHIP_TARGETS: dict[str, dict] = {
     "serie_a": {
         "accuracy_target": "72-75%",
@@ -33,3 +39,34 @@ CHAMPIONSHIP_TARGETS: dict[str, dict] = {
         "dixon_coles_rho": 0.08,
     },
 }
+
+
+@dataclass(frozen=True)
+class ChampionshipParams:
+    """``CHAMPIONSHIP_TARGETS`` entry with defaults applied and values already typed."""
+
+    home_advantage: float
+    pace_intensity: float
+    weather_impact: float
+    dixon_coles_rho: float
+    early_season_matchday_cap: int
+    key_features: tuple[str, ...]
+    accuracy_target: str | None
+
+
+def _params_from_target(target: dict[str, Any]) -> ChampionshipParams:
+    m_cap = int(target.get("early_season_matchday_cap", 12) or 12)
+    return ChampionshipParams(
+        home_advantage=float(target.get("home_advantage", 0.12)),
+        pace_intensity=float(target.get("pace_intensity", 0.0)),
+        weather_impact=float(target.get("weather_impact", 0.0)),
+        dixon_coles_rho=float(target.get("dixon_coles_rho", 0.08)),
+        early_season_matchday_cap=max(m_cap, 6),
+        key_features=tuple(target.get("key_features", [])),
+        accuracy_target=target.get("accuracy_target"),
+    )
+
+
+# Built once at import so per-prediction code reads attributes instead of dict.get + float().
+CHAMPIONSHIP_PARAMS: dict[str, ChampionshipParams] = {k: _params_from_target(v) for k, v in CHAMPIONSHIP_TARGETS.items()}
+DEFAULT_CHAMPIONSHIP_PARAMS = _params_from_target({})
@@ -10,28 +10,53 @@ def poisson_pmf(k: int, lam: float) -> float:
     return math.exp(-lam) * (lam**k) / math.factorial(k)
 
 
-def match_probabilities(*, lam_home: float, lam_away: float, max_goals: int = 10) -> dict[str, Any]:
+def poisson_pmf_vector(lam: float, n: int) -> list[float]:
+    """``[poisson_pmf(k, lam) for k in range(n)]`` via pmf(k) = pmf(k - 1) * lam / k."""
+    if lam <= 0:
+        return [1.0] + [0.0] * (n - 1)
+    out = [0.0] * n
+    p = math.exp(-lam)
+    for k in range(n):
+        out[k] = p
+        p *= lam / (k + 1)
+    return out
+
+
+def match_probabilities(
+    *,
+    lam_home: float,
+    lam_away: float,
+    max_goals: int = 10,
+    pmf_home: list[float] | None = None,
+    pmf_away: list[float] | None = None,
+) -> dict[str, Any]:
+    # Callers that also run dixon_coles_1x2 pass the PMFs in so they are built once.
+    n = max_goals + 1
+    px = pmf_home if pmf_home is not None else poisson_pmf_vector(lam_home, n)
+    py = pmf_away if pmf_away is not None else poisson_pmf_vector(lam_away, n)
+
+    # Every market is a sum over the independent (x, y) grid, so each reduces to O(n)
+    # with the running away-goals CDF instead of visiting all n * n cells.
     p_home = 0.0
     p_draw = 0.0
     p_away = 0.0
-    p_over_25 = 0.0
-    p_btts = 0.0
-
-    for x in range(max_goals + 1):
-        px = poisson_pmf(x, lam_home)
-        for y in range(max_goals + 1):
-            py = poisson_pmf(y, lam_away)
-            p = px * py
-            if x > y:
-                p_home += p
-            elif x == y:
-                p_draw += p
-            else:
-                p_away += p
-            if (x + y) >= 3:
-                p_over_25 += p
-            if x >= 1 and y >= 1:
-                p_btts += p
+    total_x = sum(px)
+    total_y = sum(py)
+    below = 0.0
+    for x in range(n):
+        p_home += px[x] * below
+        p_draw += px[x] * py[x]
+        below += py[x]
+        p_away += px[x] * (total_y - below)
+
+    # Over 2.5 is everything but the six cells with x + y <= 2; BTTS drops row and column 0.
+    under_25 = px[0] * py[0]
+    if n > 1:
+        under_25 += px[0] * py[1] + px[1] * py[0] + px[1] * py[1]
+    if n > 2:
+        under_25 += px[0] * py[2] + px[2] * py[0]
+    p_over_25 = total_x * total_y - under_25
+    p_btts = (total_x - px[0]) * (total_y - py[0])
 
     s = p_home + p_draw + p_away
     if s <= 0:
@@ -24,4 +24,3 @@ async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
     loop = asyncio.get_running_loop()
     ctx = contextvars.copy_context()
     return await loop.run_in_executor(CPU_POOL, lambda: ctx.run(fn, *args, **kwargs))
-
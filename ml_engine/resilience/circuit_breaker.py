@@ -17,7 +17,7 @@ class CircuitOpenError(RuntimeError):
 class CircuitSnapshot:
     state: str
     failures: int
-    opened_at: float | None
+    opened_at: float | None  # time.monotonic() reading, not a wall-clock timestamp
     half_open_calls: int
 
 
@@ -74,7 +74,25 @@ class CircuitBreaker:
             self._half_open_calls = 0
 
     def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
-        now = time.time()
+        # Fast path: a closed breaker admits the call without locking. The lock is only
+        # taken to record a failure, or to clear the failure count after a success when
+        # earlier failures were recorded. An unlocked read racing a trip can admit one
+        # extra call, which is harmless.
+        if self._state == "CLOSED":
+            try:
+                out = fn(*args, **kwargs)
+            except Exception:
+                now = time.monotonic()
+                with self._lock:
+                    self._on_failure(now)
+                raise
+            if self._failures:
+                with self._lock:
+                    if self._state == "CLOSED":
+                        self._failures = 0
+            return out
+
+        now = time.monotonic()
         with self._lock:
             self._allow_call(now)
         try:
@@ -94,6 +112,10 @@ _REGISTRY: dict[str, CircuitBreaker] = {}
 
 def get_breaker(name: str) -> CircuitBreaker:
     k = str(name or "").strip() or "default"
+    # Breakers are never removed, so a hit needs no lock; only creation is serialized.
+    b = _REGISTRY.get(k)
+    if b is not None:
+        return b
     with _REGISTRY_LOCK:
         b = _REGISTRY.get(k)
         if b is None:
@@ -6,20 +6,10 @@ from dataclasses import dataclass
 @dataclass(frozen=True)
 class Degradation:
     level: int
-    warnings: list[str]
+    warnings: tuple[str, ...]
 
 
 def build_degradation(*, cache_disabled: bool, calibration_disabled: bool, deadline_low: bool) -> Degradation:
-    level = 0
-    warnings: list[str] = []
-    if cache_disabled:
-        level = max(level, 1)
-        warnings.append("cache_disabled")
-    if calibration_disabled:
-        level = max(level, 2)
-        warnings.append("calibration_disabled")
-    if deadline_low:
-        level = max(level, 1)
-        warnings.append("deadline_low")
-    return Degradation(level=level, warnings=warnings)
-
+    level = 2 if calibration_disabled else 1 if (cache_disabled or deadline_low) else 0
+    flags = (("cache_disabled", cache_disabled), ("calibration_disabled", calibration_disabled), ("deadline_low", deadline_low))
+    return Degradation(level=level, warnings=tuple(name for name, on in flags if on))
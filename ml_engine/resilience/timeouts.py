@@ -3,11 +3,16 @@ from __future__ import annotations
 import contextvars
 import os
 import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
 
 
 _deadline_at: contextvars.ContextVar[float | None] = contextvars.ContextVar("deadline_at_monotonic", default=None)
 
 
+# Read once per process; default_deadline_ms.cache_clear() picks up a changed env var.
+@lru_cache(maxsize=1)
 def default_deadline_ms() -> int:
     try:
         v = int(str(os.getenv("FORECAST_REQUEST_DEADLINE_MS", "900") or "").strip())
@@ -32,6 +37,20 @@ def reset_deadline(token: contextvars.Token) -> None:
     _deadline_at.reset(token)
 
 
+@contextmanager
+def deadline_scope(ms: int) -> Iterator[None]:
+    """Apply a deadline of ``ms`` (<= 0 for none) to the enclosed block, restoring the previous one on exit.
+
+    Tasks and executor calls started inside the block copy the current context, so they
+    inherit the deadline without it leaking past the block.
+    """
+    token = set_deadline_ms(ms)
+    try:
+        yield
+    finally:
+        _deadline_at.reset(token)
+
+
 def deadline_at_monotonic() -> float | None:
     v = _deadline_at.get()
     return float(v) if isinstance(v, (int, float)) else None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -9,13 +10,16 @@ from typing import Any
 from ml_engine.config import artifact_dir, monitoring_dir, strict_calibrator_enabled
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SafeModeState:
     enabled: bool
     reason: str | None
 
 
-_CACHE: dict[str, Any] = {"loaded_at": 0.0, "ttl_s": 600.0, "by_champ": {}}
+# by_champ: championship -> (state, time.monotonic() when it was read);
+# files: safe-mode file path -> (mtime_ns, state parsed from it).
+_CACHE: dict[str, Any] = {"ttl_s": 600.0, "by_champ": {}, "files": {}}
+_LOAD_LOCK = threading.Lock()
 
 
 def _safe_mode_path(championship: str) -> Path:
@@ -27,28 +31,39 @@ def _calibrator_exists(championship: str) -> bool:
 
 
 def get_safe_mode(championship: str) -> SafeModeState:
-    now = time.time()
+    now = time.monotonic()
     ttl = float(_CACHE.get("ttl_s") or 600.0)
-    if now - float(_CACHE.get("loaded_at") or 0.0) > ttl:
-        _CACHE["loaded_at"] = now
-        _CACHE["by_champ"] = {}
+    by: dict[str, tuple[SafeModeState, float]] = _CACHE["by_champ"]
+    entry = by.get(championship)
+    if entry is not None and now - entry[1] <= ttl:
+        return entry[0]
+
+    # Expiry is per championship; the lock only serializes refreshes so concurrent
+    # misses do not all re-read the same file.
+    with _LOAD_LOCK:
+        entry = by.get(championship)
+        if entry is not None and now - entry[1] <= ttl:
+            return entry[0]
+        st = _read_safe_mode(championship)
+        by[championship] = (st, time.monotonic())
+        return st
 
-    by = _CACHE.get("by_champ")
-    if isinstance(by, dict) and isinstance(by.get(championship), SafeModeState):
-        return by[championship]
 
+def _read_safe_mode(championship: str) -> SafeModeState:
     if strict_calibrator_enabled() and not _calibrator_exists(championship):
-        st = SafeModeState(enabled=True, reason="calibrator_missing")
-        if isinstance(by, dict):
-            by[championship] = st
-        return st
+        return SafeModeState(enabled=True, reason="calibrator_missing")
 
     p = _safe_mode_path(championship)
-    if not p.exists():
-        st = SafeModeState(enabled=False, reason=None)
-        if isinstance(by, dict):
-            by[championship] = st
-        return st
+    try:
+        mtime_ns = p.stat().st_mtime_ns
+    except OSError:
+        return SafeModeState(enabled=False, reason=None)
+
+    # A TTL expiry on an unchanged file costs one stat, not a re-read and re-parse.
+    files: dict[str, tuple[int, SafeModeState]] = _CACHE["files"]
+    parsed = files.get(str(p))
+    if parsed is not None and parsed[0] == mtime_ns:
+        return parsed[1]
 
     try:
         raw = json.loads(p.read_text(encoding="utf-8"))
@@ -61,9 +76,6 @@ def get_safe_mode(championship: str) -> SafeModeState:
         enabled = bool(raw.get("safe_mode") or raw.get("enabled"))
         rr = raw.get("safe_mode_reason") or raw.get("reason")
         reason = str(rr) if rr is not None else None
-
     st = SafeModeState(enabled=enabled, reason=reason)
-    if isinstance(by, dict):
-        by[championship] = st
+    files[str(p)] = (mtime_ns, st)
     return st
-
@@ -1,20 +1,22 @@
 from __future__ import annotations
 
-import json
 import os
 import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from ml_engine.json_io import loads_json_bytes
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class RatingsLookup:
     strength: float
     meta: dict[str, Any]
 
 
-_CACHE: dict[str, Any] = {"path": None, "mtime_ns": None, "data": None}
+_CACHE: dict[str, Any] = {"path": None, "mtime_ns": None, "size": None, "data": None}
 
 
 def _default_ratings_path() -> str:
@@ -26,52 +28,80 @@ def _load_ratings(path: str) -> dict[str, Any] | None:
     try:
         st = p.stat()
     except Exception:
-        _CACHE.update({"path": str(p), "mtime_ns": None, "data": None})
+        _CACHE.update({"path": str(p), "mtime_ns": None, "size": None, "data": None})
         return None
 
-    if _CACHE.get("path") == str(p) and _CACHE.get("mtime_ns") == st.st_mtime_ns and isinstance(_CACHE.get("data"), dict):
+    # Size as well as mtime: builds that pin file timestamps (e.g. reproducible/Nix
+    # images) can swap the file without changing mtime_ns.
+    if _CACHE.get("path") == str(p) and _CACHE.get("mtime_ns") == st.st_mtime_ns and _CACHE.get("size") == st.st_size and isinstance(_CACHE.get("data"), dict):
         return _CACHE["data"]
 
     try:
-        raw = p.read_text(encoding="utf-8")
-        data = json.loads(raw)
+        data = loads_json_bytes(p.read_bytes())
     except Exception:
-        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": None})
+        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": None})
         return None
 
     if not isinstance(data, dict):
-        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": None})
+        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": None})
         return None
 
-    norm_index: dict[str, dict[str, str]] = {}
-    champs = data.get("championships")
-    if isinstance(champs, dict):
-        for champ, champ_row in champs.items():
-            if not isinstance(champ_row, dict):
-                continue
-            teams = champ_row.get("teams")
-            if not isinstance(teams, dict):
-                continue
-            idx: dict[str, str] = {}
-            for name in teams.keys():
-                if not isinstance(name, str):
-                    continue
-                n = _normalize_team_name(name)
-                if n and n not in idx:
-                    idx[n] = name
-            norm_index[str(champ)] = idx
-
-    _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": data, "norm_index": norm_index})
+    _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data, "norm_index": {}, "trigrams": {}, "lookups": {}})
     return data
 
 
-def _normalize_team_name(s: str) -> str:
-    v0 = str(s or "").lower()
-    v = "".join(ch for ch in unicodedata.normalize("NFKD", v0) if not unicodedata.combining(ch))
-    for ch in ("’", "'", ".", ",", "(", ")", "[", "]", "-", "_", "/", "\\"):
-        v = v.replace(ch, " ")
-    parts = [p for p in v.split() if p]
-    drop = {
+def _champ_norm_index(championship: str, teams: dict[str, Any]) -> dict[str, str]:
+    """Normalized name -> original name for one championship of the loaded ratings.
+
+    Built on the championship's first non-exact lookup rather than for every
+    championship at load time; dropped with the rest of the cache on reload.
+    """
+    norm_index = _CACHE.get("norm_index")
+    if not isinstance(norm_index, dict):
+        norm_index = {}
+        _CACHE["norm_index"] = norm_index
+    champ_idx = norm_index.get(championship)
+    if champ_idx is None:
+        champ_idx = {}
+        for name in teams.keys():
+            if not isinstance(name, str):
+                continue
+            n = _normalize_team_name(name)
+            if n and n not in champ_idx:
+                champ_idx[n] = name
+        norm_index[championship] = champ_idx
+    return champ_idx
+
+
+def _champ_trigram_index(championship: str, champ_idx: dict[str, str]) -> tuple[list[tuple[str, str]], dict[str, list[int]]]:
+    """``(candidates, trigram -> candidate positions)`` over one championship's normalized names.
+
+    A substring match of at least 5 characters shares every trigram of the shorter name,
+    so only candidates sharing a trigram with the query can match. Positions ascend, so
+    scoring them in order keeps the original first-best tie-break.
+    """
+    trigrams = _CACHE.get("trigrams")
+    if not isinstance(trigrams, dict):
+        trigrams = {}
+        _CACHE["trigrams"] = trigrams
+    entry = trigrams.get(championship)
+    if entry is None:
+        cands = [(k, v) for k, v in champ_idx.items() if k]
+        index: dict[str, list[int]] = {}
+        for pos, (cand_norm, _) in enumerate(cands):
+            for g in {cand_norm[i : i + 3] for i in range(len(cand_norm) - 2)}:
+                index.setdefault(g, []).append(pos)
+        entry = (cands, index)
+        trigrams[championship] = entry
+    return entry
+
+
+# Punctuation that separates name tokens; translated to spaces before splitting.
+_PUNCT_TO_SPACE = str.maketrans(dict.fromkeys("’'.,()[]-_/\\", " "))
+
+# Club-form tokens ignored when matching team names ("AC Milan" ~ "Milan").
+_DROP_WORDS = frozenset(
+    {
         "fc",
         "cfc",
         "afc",
@@ -99,19 +129,46 @@ def _normalize_team_name(s: str) -> str:
         "rb",
         "hellas",
     }
-    kept = [p for p in parts if p not in drop]
+)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_team_name(s: str) -> str:
+    v0 = str(s or "").lower()
+    v = "".join(ch for ch in unicodedata.normalize("NFKD", v0) if not unicodedata.combining(ch))
+    v = v.translate(_PUNCT_TO_SPACE)
+    parts = [p for p in v.split() if p]
+    kept = [p for p in parts if p not in _DROP_WORDS]
     if not kept:
         kept = parts
     out = "".join(ch for ch in "".join(kept) if ch.isalpha())
     return out
 
 
+_LOOKUPS_MAX = 4096
+
+
 def get_team_strength(*, championship: str, team: str, ratings_path: str | None = None) -> RatingsLookup | None:
     path = ratings_path or _default_ratings_path()
     data = _load_ratings(path)
     if not isinstance(data, dict):
         return None
 
+    # Resolved lookups live alongside the loaded file and are dropped when it reloads.
+    lookups = _CACHE.get("lookups")
+    memo_key = (championship, team)
+    if isinstance(lookups, dict):
+        if memo_key in lookups:
+            return lookups[memo_key]
+        if len(lookups) >= _LOOKUPS_MAX:
+            lookups.clear()
+    out = _lookup_team(data, championship=championship, team=team, path=path)
+    if isinstance(lookups, dict):
+        lookups[memo_key] = out
+    return out
+
+
+def _lookup_team(data: dict[str, Any], *, championship: str, team: str, path: str) -> RatingsLookup | None:
     champs = data.get("championships")
     if not isinstance(champs, dict):
         return None
@@ -128,28 +185,27 @@ def get_team_strength(*, championship: str, team: str, ratings_path: str | None
     row = teams.get(key)
     if not isinstance(row, dict):
         n = _normalize_team_name(key)
-        idx = _CACHE.get("norm_index")
-        if isinstance(idx, dict):
-            champ_idx = idx.get(str(championship))
-            if isinstance(champ_idx, dict) and isinstance(n, str) and n:
-                mapped = champ_idx.get(n)
-                if isinstance(mapped, str):
-                    row = teams.get(mapped)
-                if not isinstance(row, dict):
-                    best_mapped: str | None = None
-                    best_len = 0
-                    for cand_norm, original_name in champ_idx.items():
-                        if not isinstance(cand_norm, str) or not isinstance(original_name, str):
-                            continue
-                        if not cand_norm:
-                            continue
-                        if cand_norm in n or n in cand_norm:
-                            overlap = min(len(cand_norm), len(n))
-                            if overlap >= 5 and overlap > best_len:
-                                best_len = overlap
-                                best_mapped = original_name
-                    if isinstance(best_mapped, str):
-                        row = teams.get(best_mapped)
+        if n:
+            champ_idx = _champ_norm_index(str(championship), teams)
+            mapped = champ_idx.get(n)
+            if isinstance(mapped, str):
+                row = teams.get(mapped)
+            if not isinstance(row, dict) and len(n) >= 5:
+                cands, index = _champ_trigram_index(str(championship), champ_idx)
+                positions: set[int] = set()
+                for i in range(len(n) - 2):
+                    positions.update(index.get(n[i : i + 3], ()))
+                best_mapped: str | None = None
+                best_len = 0
+                for pos in sorted(positions):
+                    cand_norm, original_name = cands[pos]
+                    if cand_norm in n or n in cand_norm:
+                        overlap = min(len(cand_norm), len(n))
+                        if overlap >= 5 and overlap > best_len:
+                            best_len = overlap
+                            best_mapped = original_name
+                if isinstance(best_mapped, str):
+                    row = teams.get(best_mapped)
     if not isinstance(row, dict):
         return None
 
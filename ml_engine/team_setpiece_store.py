@@ -1,33 +1,62 @@
 from __future__ import annotations
 
-import json
 import os
 import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from ml_engine.json_io import loads_json_bytes
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SetPieceLookup:
     off_index: float
     def_index: float
     meta: dict[str, Any]
 
 
-_CACHE: dict[str, Any] = {"path": None, "mtime": None, "payload": None}
+_CACHE: dict[str, Any] = {"path": None, "mtime": None, "payload": None, "norm_index": {}, "metas": {}}
+
 
+_PUNCT_TO_SPACE = str.maketrans(dict.fromkeys("’'.,-_", " "))
 
+
+@lru_cache(maxsize=4096)
 def _norm_team_name(s: str) -> str:
     s = str(s or "").strip().lower()
     s = unicodedata.normalize("NFKD", s)
     s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    for ch in ["’", "'", ".", ",", "-", "_"]:
-        s = s.replace(ch, " ")
+    s = s.translate(_PUNCT_TO_SPACE)
     s = " ".join(s.split())
     return s
 
 
+def _champ_norm_index(championship: str, teams: dict[str, Any]) -> dict[str, str]:
+    # Normalized name -> first team key with that name, built once per championship
+    # per loaded payload instead of renormalizing every team on each non-exact lookup.
+    norm_index = _CACHE["norm_index"]
+    champ_idx = norm_index.get(championship)
+    if champ_idx is None:
+        champ_idx = {}
+        for k, v in teams.items():
+            if isinstance(v, dict):
+                champ_idx.setdefault(_norm_team_name(k), k)
+        norm_index[championship] = champ_idx
+    return champ_idx
+
+
+def _champ_meta(championship: str, champ: dict[str, Any]) -> dict[str, Any]:
+    # One copy of the championship meta per loaded payload, shared by its lookups.
+    metas = _CACHE["metas"]
+    meta = metas.get(championship)
+    if meta is None:
+        meta = dict(champ.get("meta", {}) or {})
+        metas[championship] = meta
+    return meta
+
+
 def _load_payload(path: str) -> dict[str, Any] | None:
     try:
         p = Path(path)
@@ -36,9 +65,9 @@ def _load_payload(path: str) -> dict[str, Any] | None:
         mtime = p.stat().st_mtime
         if _CACHE["path"] == str(p) and _CACHE["mtime"] == mtime and isinstance(_CACHE["payload"], dict):
             return _CACHE["payload"]
-        payload = json.loads(p.read_text(encoding="utf-8"))
+        payload = loads_json_bytes(p.read_bytes())
         if isinstance(payload, dict):
-            _CACHE.update({"path": str(p), "mtime": mtime, "payload": payload})
+            _CACHE.update({"path": str(p), "mtime": mtime, "payload": payload, "norm_index": {}, "metas": {}})
             return payload
     except Exception:
         return None
@@ -69,24 +98,23 @@ def get_team_setpieces(*, championship: str, team: str, path: str | None = None)
             return SetPieceLookup(
                 off_index=float(t_exact.get("off_index", 0.0) or 0.0),
                 def_index=float(t_exact.get("def_index", 0.0) or 0.0),
-                meta=dict(champ.get("meta", {}) or {}),
+                meta=_champ_meta(str(championship), champ),
             )
         except Exception:
             return None
 
-    want = _norm_team_name(team)
-    for k, v in teams.items():
-        if _norm_team_name(k) == want and isinstance(v, dict):
-            try:
-                return SetPieceLookup(
-                    off_index=float(v.get("off_index", 0.0) or 0.0),
-                    def_index=float(v.get("def_index", 0.0) or 0.0),
-                    meta=dict(champ.get("meta", {}) or {}),
-                )
-            except Exception:
-                return None
-
-    return None
+    k = _champ_norm_index(str(championship), teams).get(_norm_team_name(team))
+    if k is None:
+        return None
+    v = teams[k]
+    try:
+        return SetPieceLookup(
+            off_index=float(v.get("off_index", 0.0) or 0.0),
+            def_index=float(v.get("def_index", 0.0) or 0.0),
+            meta=_champ_meta(str(championship), champ),
+        )
+    except Exception:
+        return None
 
 
 def get_team_setpiece(*, championship: str, team: str, setpiece_path: str | None = None) -> SetPieceLookup | None:
@@ -1,34 +1,34 @@
 from __future__ import annotations
 
-import json
 import os
 import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from ml_engine.json_io import loads_json_bytes
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TerritoryLookup:
     off_index: float
     def_index: float
     meta: dict[str, Any]
 
 
-_CACHE: dict[str, Any] = {"path": None, "mtime_ns": None, "data": None}
+_CACHE: dict[str, Any] = {"path": None, "mtime_ns": None, "size": None, "data": None}
 
 
 def _default_territory_path() -> str:
     return os.getenv("TERRITORY_INDEX_PATH") or os.getenv("FORECAST_TERRITORY_INDEX_PATH", "data/team_territory_index.json")
 
 
-def _normalize_team_name(s: str) -> str:
-    v0 = str(s or "").lower()
-    v = "".join(ch for ch in unicodedata.normalize("NFKD", v0) if not unicodedata.combining(ch))
-    for ch in ("’", "'", ".", ",", "(", ")", "[", "]", "-", "_", "/", "\\"):
-        v = v.replace(ch, " ")
-    parts = [p for p in v.split() if p]
-    drop = {
+_PUNCT_TO_SPACE = str.maketrans(dict.fromkeys("’'.,()[]-_/\\", " "))
+
+# Club-form tokens ignored when matching team names ("AC Milan" ~ "Milan").
+_DROP_WORDS = frozenset(
+    {
         "fc",
         "cfc",
         "afc",
@@ -56,7 +56,16 @@ def _normalize_team_name(s: str) -> str:
         "rb",
         "hellas",
     }
-    kept = [p for p in parts if p not in drop]
+)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_team_name(s: str) -> str:
+    v0 = str(s or "").lower()
+    v = "".join(ch for ch in unicodedata.normalize("NFKD", v0) if not unicodedata.combining(ch))
+    v = v.translate(_PUNCT_TO_SPACE)
+    parts = [p for p in v.split() if p]
+    kept = [p for p in parts if p not in _DROP_WORDS]
     if not kept:
         kept = parts
     out = "".join(ch for ch in "".join(kept) if ch.isalpha())
@@ -68,21 +77,20 @@ def _load_territory(path: str) -> dict[str, Any] | None:
     try:
         st = p.stat()
     except Exception:
-        _CACHE.update({"path": str(p), "mtime_ns": None, "data": None})
+        _CACHE.update({"path": str(p), "mtime_ns": None, "size": None, "data": None})
         return None
 
-    if _CACHE.get("path") == str(p) and _CACHE.get("mtime_ns") == st.st_mtime_ns and isinstance(_CACHE.get("data"), dict):
+    if _CACHE.get("path") == str(p) and _CACHE.get("mtime_ns") == st.st_mtime_ns and _CACHE.get("size") == st.st_size and isinstance(_CACHE.get("data"), dict):
         return _CACHE["data"]
 
     try:
-        raw = p.read_text(encoding="utf-8")
-        data = json.loads(raw)
+        data = loads_json_bytes(p.read_bytes())
     except Exception:
-        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": None})
+        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": None})
         return None
 
     if not isinstance(data, dict):
-        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": None})
+        _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": None})
         return None
 
     norm_index: dict[str, dict[str, str]] = {}
@@ -103,7 +111,7 @@ def _load_territory(path: str) -> dict[str, Any] | None:
                     idx[n] = name
             norm_index[str(champ)] = idx
 
-    _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "data": data, "norm_index": norm_index})
+    _CACHE.update({"path": str(p), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data, "norm_index": norm_index})
     return data
 
 
@@ -68,3 +68,22 @@ def test_calibration_platt_default_method(monkeypatch) -> None:
     assert applied is True
     s = float(out["home_win"]) + float(out["draw"]) + float(out["away_win"])
     assert abs(1.0 - s) < 1e-9
+
+
+def test_team_strength_lookups_reset_on_reload(tmp_path) -> None:
+    import json
+    import os
+
+    from ml_engine.team_ratings_store import get_team_strength
+
+    path = tmp_path / "ratings.json"
+    path.write_text(json.dumps({"championships": {"serie_a": {"teams": {"Inter": {"strength": 0.4}}}}}), encoding="utf-8")
+    first = get_team_strength(championship="serie_a", team="FC Inter", ratings_path=str(path))
+    assert first is not None and first.strength == 0.4
+    assert get_team_strength(championship="serie_a", team="FC Inter", ratings_path=str(path)) is first
+
+    path.write_text(json.dumps({"championships": {"serie_a": {"teams": {"Inter": {"strength": 0.1}}}}}), encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = get_team_strength(championship="serie_a", team="FC Inter", ratings_path=str(path))
+    assert second is not None and second.strength == 0.1
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from ml_engine.ensemble_predictor.service import EnsemblePredictorService
+
+
+@pytest.fixture()
+def team_indexes(tmp_path, monkeypatch):
+    territory = {"championships": {"serie_a": {"teams": {"Roma": {"off_index": 55.0, "def_index": 48.0}, "Inter": {"off_index": 60.0, "def_index": 45.0}}}}}
+    setpieces = {"championships": {"serie_a": {"meta": {"source": "test"}, "teams": {"Roma": {"off_index": 52.0, "def_index": 50.0}, "Inter": {"off_index": 58.0, "def_index": 47.0}}}}}
+    (tmp_path / "territory.json").write_text(json.dumps(territory), encoding="utf-8")
+    (tmp_path / "setpieces.json").write_text(json.dumps(setpieces), encoding="utf-8")
+    monkeypatch.setenv("TERRITORY_INDEX_PATH", str(tmp_path / "territory.json"))
+    monkeypatch.setenv("SETPIECE_INDEX_PATH", str(tmp_path / "setpieces.json"))
+
+
+@pytest.mark.parametrize(
+    "home,away,status",
+    [
+        ("Inter", "Roma", "PREMATCH"),
+        ("Inter", "Roma", "LIVE"),
+        ("Nobody", "Roma", "SCHEDULED"),
+        ("Nobody", "Roma", "LIVE"),
+    ],
+)
+def test_team_meta_reported_when_either_side_has_data(team_indexes, home: str, away: str, status: str) -> None:
+    out = EnsemblePredictorService().predict(championship="serie_a", home_team=home, away_team=away, status=status, context={"matchday": 12})
+    explain = out["explain"]
+
+    assert "territory_meta" in explain
+    assert "setpiece_meta" in explain
+    assert explain["setpiece_meta"] == {"source": "test"}
+    # The adjustments themselves only apply pre-match with both teams present.
+    assert explain["territory"]["available"] is (status != "LIVE" and home != "Nobody")
+    assert explain["set_pieces"]["available"] is (status != "LIVE" and home != "Nobody")
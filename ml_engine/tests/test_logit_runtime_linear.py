@@ -0,0 +1,62 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from ml_engine.logit_1x2_runtime import _compile_linear, _linear_proba
+
+
+def _fit_pipeline(n_features: int) -> Pipeline:
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(300, n_features))
+    X[rng.random(X.shape) < 0.1] = np.nan
+    y = rng.choice(["H", "D", "A"], size=300)
+    pipe = Pipeline(steps=[("imputer", SimpleImputer(strategy="median")), ("scaler", StandardScaler()), ("clf", LogisticRegression(max_iter=200))])
+    return pipe.fit(X, y)
+
+
+def test_compiled_linear_matches_predict_proba() -> None:
+    pipe = _fit_pipeline(6)
+    linear = _compile_linear(pipe, 6)
+    assert linear is not None
+
+    rnd = random.Random(11)
+    for _ in range(50):
+        row = [rnd.gauss(0.0, 2.0) if rnd.random() > 0.3 else math.nan for _ in range(6)]
+        expected = pipe.predict_proba(np.asarray([row], dtype=float))[0]
+        got = _linear_proba(linear, row)
+        assert got == pytest.approx(list(expected), abs=1e-12)
+
+
+def test_compile_linear_rejects_other_pipelines() -> None:
+    pipe = _fit_pipeline(6)
+    assert _compile_linear(pipe, 5) is None
+    assert _compile_linear(Pipeline(steps=[("clf", pipe.named_steps["clf"])]), 6) is None
+
+
+def test_predict_1x2_maps_columns_by_fitted_classes(tmp_path, monkeypatch) -> None:
+    import joblib
+
+    from ml_engine.logit_1x2_runtime import load_model, predict_1x2
+
+    pipe = _fit_pipeline(3)
+    cols = ["f0", "f1", "f2"]
+    joblib.dump({"pipeline": pipe, "feature_cols": cols, "labels": ["H", "D", "A"]}, tmp_path / "model_1x2_test.joblib")
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path))
+    load_model.cache_clear()
+    try:
+        out = predict_1x2(championship="test", features={"f0": 1.5, "f1": -0.5, "f2": 0.25})
+    finally:
+        load_model.cache_clear()
+
+    assert list(pipe.classes_) == ["A", "D", "H"]
+    expected = dict(zip(pipe.classes_, pipe.predict_proba(np.asarray([[1.5, -0.5, 0.25]]))[0]))
+    assert out == pytest.approx({"home_win": expected["H"], "draw": expected["D"], "away_win": expected["A"]}, abs=1e-12)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import sqlite3
+import subprocess
+import sys
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
-from ml_engine.cache.sqlite_cache import SqliteCache
+from ml_engine.cache.sqlite_cache import SqliteCache, recover_corrupt_sqlite_db
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
 def test_sqlite_cache_set_get_and_expiry(tmp_path) -> None:
@@ -32,3 +38,114 @@ def test_sqlite_cache_set_get_and_expiry(tmp_path) -> None:
     hit2 = cache.get(cache_key="k1", now_utc=later)
     assert hit2 is None
 
+
+def test_sqlite_cache_does_not_expire_before_ttl(tmp_path) -> None:
+    db = tmp_path / "cache.sqlite"
+    now = datetime(2026, 1, 1, 12, 0, 0, 900000, tzinfo=timezone.utc)
+    SqliteCache(db_path=db).set(
+        cache_key="k1",
+        championship="serie_a",
+        match_id="m1",
+        matchday=1,
+        payload={"probabilities": {"home_win": 0.5, "draw": 0.2, "away_win": 0.3}},
+        ttl_seconds=60,
+        model_version="mv",
+        feature_version="fv",
+        calibrator_version="cv",
+        inputs_hash="ih",
+        now_utc=now,
+    )
+
+    just_before = now + timedelta(seconds=59, milliseconds=950)
+    assert SqliteCache(db_path=db).get(cache_key="k1", now_utc=just_before) is not None
+
+
+def test_sqlite_cache_reopens_after_recover(tmp_path) -> None:
+    db = tmp_path / "cache.sqlite"
+    now = datetime.now(timezone.utc)
+    kwargs = dict(
+        championship="serie_a",
+        match_id="m1",
+        matchday=1,
+        payload={"probabilities": {"home_win": 0.5, "draw": 0.2, "away_win": 0.3}},
+        ttl_seconds=60,
+        model_version="mv",
+        feature_version="fv",
+        calibrator_version="cv",
+        inputs_hash="ih",
+        now_utc=now,
+    )
+    SqliteCache(db_path=db).set(cache_key="k1", **kwargs)
+    assert SqliteCache(db_path=db).get(cache_key="k1", now_utc=now) is not None
+
+    assert recover_corrupt_sqlite_db(db_path=db) is True
+    cache = SqliteCache(db_path=db)
+    assert cache.get(cache_key="k1", now_utc=now) is None
+    cache.set(cache_key="k2", **kwargs)
+    assert cache.get(cache_key="k2", now_utc=now) is not None
+
+
+def test_runtime_metrics_are_batched(tmp_path) -> None:
+    db = tmp_path / "cache.sqlite"
+    cache = SqliteCache(db_path=db)
+    cache.incr_runtime_metrics(day="2026-01-01", route="/p", latency_ms=10.0, is_error=False, cache_hits=1)
+    cache.incr_runtime_metrics(day="2026-01-01", route="/p", latency_ms=5.0, is_error=True, cache_misses=2)
+    cache.flush_runtime_metrics()
+
+    with sqlite3.connect(str(db)) as conn:
+        row = conn.execute(
+            "SELECT count, err_count, latency_ms_sum, cache_hits, cache_misses FROM metrics_runtime WHERE day = ? AND route = ?",
+            ("2026-01-01", "/p"),
+        ).fetchone()
+    assert row == (2, 1, 15.0, 1, 2)
+
+
+def _set_from_other_process(db: Path, home_win: float, now: datetime) -> None:
+    code = f"""
+from datetime import datetime
+from pathlib import Path
+from ml_engine.cache.sqlite_cache import SqliteCache
+SqliteCache(db_path=Path({str(db)!r})).set(
+    cache_key="k1",
+    championship="serie_a",
+    match_id="m1",
+    matchday=1,
+    payload={{"probabilities": {{"home_win": {home_win!r}, "draw": 0.2, "away_win": 0.3}}}},
+    ttl_seconds=60,
+    model_version="mv",
+    feature_version="fv",
+    calibrator_version="cv",
+    inputs_hash="ih",
+    now_utc=datetime.fromisoformat({now.isoformat()!r}),
+)
+"""
+    subprocess.run([sys.executable, "-c", code], cwd=str(_REPO_ROOT), check=True)
+
+
+def test_sqlite_cache_sees_writes_from_other_process(tmp_path) -> None:
+    db = tmp_path / "cache.sqlite"
+    now = datetime.now(timezone.utc)
+    cache = SqliteCache(db_path=db)
+    cache.set(
+        cache_key="k1",
+        championship="serie_a",
+        match_id="m1",
+        matchday=1,
+        payload={"probabilities": {"home_win": 0.5, "draw": 0.2, "away_win": 0.3}},
+        ttl_seconds=60,
+        model_version="mv",
+        feature_version="fv",
+        calibrator_version="cv",
+        inputs_hash="ih",
+        now_utc=now,
+    )
+    hit = cache.get(cache_key="k1", now_utc=now)
+    assert hit is not None and hit.payload["probabilities"]["home_win"] == 0.5
+
+    _set_from_other_process(db, 0.4, now)
+    hit = cache.get(cache_key="k1", now_utc=now)
+    assert hit is not None and hit.payload["probabilities"]["home_win"] == 0.4
+
+    with sqlite3.connect(str(db)) as conn:
+        conn.execute("DELETE FROM predictions_cache WHERE cache_key = ?", ("k1",))
+    assert cache.get(cache_key="k1", now_utc=now) is None